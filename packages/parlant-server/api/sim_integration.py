@@ -323,7 +323,7 @@ async def sync_workspaces_with_sim(
         for workspace_id in sync_request.workspace_ids:
             try:
                 # 1. Validate user has access to workspace
-                user_workspaces = session.user.workspaces or []
+                user_workspaces = await session.ensure_workspaces()
                 has_access = any(ws.get('id') == workspace_id for ws in user_workspaces)
 
                 if not has_access:
@@ -397,7 +397,7 @@ async def get_workspace_sync_status(
 
     try:
         # 1. Validate workspace access
-        user_workspaces = session.user.workspaces or []
+        user_workspaces = await session.ensure_workspaces()
         has_access = any(ws.get('id') == workspace_id for ws in user_workspaces)
 
         if not has_access:
@@ -488,7 +488,7 @@ async def validate_sim_integration(
 
         # 3. Permission system check
         try:
-            user_workspaces = session.user.workspaces or []
+            user_workspaces = await session.ensure_workspaces()
             permissions_healthy = isinstance(user_workspaces, list)
             validation_results['checks'].append({
                 'check': 'permission_system',
@@ -61,6 +61,7 @@ async def get_auth_status(request: Request):
         if authorization:
             session = await auth_bridge.authenticate_request(authorization)
             if session:
+                await session.ensure_workspaces()
                 return AuthStatusResponse(
                     authenticated=True,
                     user={
@@ -105,6 +106,7 @@ async def validate_token(request: TokenValidationRequest):
         session = await auth_bridge.validate_session_token(request.token)
 
         if session:
+            await session.ensure_workspaces()
             return TokenValidationResponse(
                 valid=True,
                 user={
@@ -131,6 +133,7 @@ async def get_current_user_info(session: SimSession = Depends(get_current_sessio
 
     Requires authentication. Returns detailed user profile and workspace access.
     """
+    await session.ensure_workspaces()
     return {
         "user": {
             "id": session.user.id,
@@ -159,6 +162,7 @@ async def list_user_workspaces(session: SimSession = Depends(get_current_session
 
     Returns workspace information with user's role and permissions in each workspace.
     """
+    await session.ensure_workspaces()
     return {
         "workspaces": session.user.workspaces,
         "active_organization_id": session.active_organization_id,
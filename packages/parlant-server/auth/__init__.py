@@ -194,6 +194,11 @@ class WorkspaceIsolationSystem:
             self.context_manager.isolation_manager = self.isolation_manager
             self.access_controller.isolation_manager = self.isolation_manager
 
+            # Preload recently-active sessions so reconnecting clients hit
+            # warm in-memory state instead of one database load each
+            # (warmup logs and returns 0 on failure rather than raising)
+            await self.session_manager.warmup()
+
             # Initialize integration validator with all components
             self.integration_validator = WorkspaceIsolationValidator(
                 self.db_session,
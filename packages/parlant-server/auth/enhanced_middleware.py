@@ -130,6 +130,10 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
 
             session = auth_result["session"]
 
+            # Resolve lazily-loaded workspaces before anything downstream
+            # reads session.user.workspaces
+            await session.ensure_workspaces()
+
             # Add session to request state
             request.state.session = session
             request.state.user = session.user
@@ -461,9 +465,10 @@ class EnhancedAuthenticationMiddleware(BaseHTTPMiddleware):
                 )
                 return session
 
-            # Enrich session with workspace information
+            # Enrich session with workspace information (marks them loaded
+            # so the lazy loader won't clobber the enrichment)
             if "workspaces" in user_context:
-                session.user.workspaces = user_context["workspaces"]
+                session.user.set_workspaces(user_context["workspaces"])
 
             if user_context.get("active_organization_id"):
                 session.active_organization_id = user_context["active_organization_id"]
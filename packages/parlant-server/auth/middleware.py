@@ -6,6 +6,7 @@ Handles authentication and authorization for all incoming requests
 import logging
 from typing import Optional
 
+import structlog
 from fastapi import Request, Response, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -59,6 +60,9 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         """Process request through authentication middleware."""
 
+        # Drop any auth context bound by a previous request on this task
+        structlog.contextvars.clear_contextvars()
+
         # Skip authentication for public endpoints
         if self._is_public_endpoint(request.url.path):
             return await call_next(request)
@@ -78,6 +82,11 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
                 media_type="application/json"
             )
 
+        # Workspaces load lazily during validation; resolve them here so
+        # route handlers and sync helpers (permission indexes etc.) see
+        # the user's real workspace list, not an unloaded placeholder
+        await session.ensure_workspaces()
+
         # Add session to request state for use in route handlers
         request.state.session = session
         request.state.user = session.user
@@ -165,9 +174,10 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
                 logger.warning(f"User context mismatch: {user_context.get('user_id')} != {session.user.id}")
                 return session
 
-            # Update session with enriched workspace information
+            # Update session with enriched workspace information (marks them
+            # loaded so the lazy loader won't clobber the enrichment)
             if "workspaces" in user_context:
-                session.user.workspaces = user_context["workspaces"]
+                session.user.set_workspaces(user_context["workspaces"])
 
             # Set active organization from context if provided
             if user_context.get("active_organization_id"):
@@ -197,6 +207,9 @@ async def auth_middleware(request: Request, call_next):
     if session is None:
         raise HTTPException(status_code=401, detail="Authentication required")
 
+    # Resolve lazily-loaded workspaces before handlers read them
+    await session.ensure_workspaces()
+
     # Add session to request state
     request.state.session = session
     request.state.user = session.user
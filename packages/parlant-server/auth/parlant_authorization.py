@@ -351,6 +351,10 @@ class SimParlantAuthorizationPolicy(AuthorizationPolicy):
         if not session:
             return {}
 
+        # Workspaces load lazily - resolve them before they are embedded
+        # in the context below
+        await session.ensure_workspaces()
+
         # Get workspace context
         workspace_id = await self._extract_workspace_id(request)
         subscription_plan = await self._get_user_subscription_plan(session.user.id)
@@ -13,15 +13,17 @@ Features:
 - Real-time validation
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Set, Union
+import time
+from typing import Dict, Any, Iterable, Optional, List, Set, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import uuid
 import json
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
@@ -32,6 +34,11 @@ from auth.workspace_context import OperationContext, WorkspaceContextManager
 logger = logging.getLogger(__name__)
 
 
+async def _none() -> None:
+    """Awaitable placeholder used when a concurrent lookup is not needed."""
+    return None
+
+
 class SessionIsolationLevel(Enum):
     """Levels of session isolation."""
     STRICT = "strict"  # Complete isolation, no cross-workspace data
@@ -57,6 +64,11 @@ class SessionIsolationConfig:
     max_session_duration: timedelta = field(default_factory=lambda: timedelta(hours=24))
     event_retention_days: int = 30
 
+    def __post_init__(self):
+        # Cache the enum value strings - read per row when listing sessions
+        self._level_str = self.isolation_level.value
+        self._scope_str = self.conversation_scope.value
+
 
 @dataclass
 class IsolatedSession:
@@ -71,18 +83,23 @@ class IsolatedSession:
     last_activity: datetime = field(default_factory=datetime.now)
     is_active: bool = True
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Isolation token is immutable for the session's lifetime - computed once
+    isolation_token: str = field(init=False)
+    # Expiry as epoch seconds so is_expired is a float compare, not
+    # datetime/timedelta arithmetic (checked per session in cleanup loops)
+    _expires_at: float = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.isolation_token = f"ws_{self.workspace_id}_sess_{self.session_id[:12]}"
+        self._expires_at = (
+            self.created_at.timestamp()
+            + self.isolation_config.max_session_duration.total_seconds()
+        )
 
     @property
     def is_expired(self) -> bool:
         """Check if session has expired."""
-        if not self.is_active:
-            return True
-        return datetime.now() - self.created_at > self.isolation_config.max_session_duration
-
-    @property
-    def isolation_token(self) -> str:
-        """Generate isolation token for this session."""
-        return f"ws_{self.workspace_id}_sess_{self.session_id[:12]}"
+        return not self.is_active or time.time() > self._expires_at
 
 
 class SessionIsolationManager:
@@ -103,8 +120,48 @@ class SessionIsolationManager:
         # Session to workspace mapping for quick lookup
         self._session_workspace_map: Dict[str, str] = {}
 
-        # Event filtering cache
-        self._event_filter_cache: Dict[str, str] = {}
+        # Access decision cache: (session_id, user_id) -> (allowed, expires_at)
+        # The expensive part is the authorization decision, not the SQL
+        # templating, so cache the decision with a short TTL
+        self._access_decision_cache: Dict[tuple, tuple] = {}
+        self._access_decision_ttl = 30.0  # seconds
+
+        # Precompiled accessible-sessions statements, keyed by
+        # (workspace filter present, active-only filter present)
+        self._accessible_sessions_stmts = {
+            (with_workspace, active_only): text(
+                self._build_accessible_sessions_sql(with_workspace, active_only)
+            )
+            for with_workspace in (True, False)
+            for active_only in (True, False)
+        }
+
+    @staticmethod
+    def _build_accessible_sessions_sql(with_workspace: bool, active_only: bool) -> str:
+        """Build one variant of the accessible-sessions query."""
+        sql = """
+            SELECT s.id, s.agent_id, s.workspace_id, s.user_id, s.customer_id,
+                   s.title, s.status, s.mode, s.started_at, s.last_activity_at,
+                   s.message_count, s.event_count,
+                   a.name as agent_name, a.description as agent_description
+            FROM parlant_session s
+            JOIN parlant_agent a ON s.agent_id = a.id
+            LEFT JOIN LATERAL (
+                SELECT 1 FROM permissions p
+                WHERE p.user_id = :user_id
+                AND p.entity_type = 'workspace'
+                AND p.entity_id = s.workspace_id
+                AND p.permission_type IN ('read', 'write', 'admin')
+                LIMIT 1
+            ) perm ON TRUE
+            WHERE (s.user_id = :user_id OR perm IS NOT NULL)
+        """
+        if with_workspace:
+            sql += " AND s.workspace_id = :workspace_id"
+        if active_only:
+            sql += " AND s.status = 'active'"
+        sql += " ORDER BY s.last_activity_at DESC LIMIT :lim OFFSET :off"
+        return sql
 
     async def create_isolated_session(
         self,
@@ -172,6 +229,83 @@ class SessionIsolationManager:
 
         return isolated_session
 
+    async def warmup(
+        self,
+        workspace_ids: Optional[Iterable[str]] = None,
+        limit: int = 10_000
+    ) -> int:
+        """
+        Bulk-load recent active sessions into memory.
+
+        Called at service startup (WorkspaceIsolationSystem.initialize) so
+        reconnecting clients hit warm in-memory sessions instead of triggering
+        one _load_session_from_database round-trip each.
+
+        Args:
+            workspace_ids: Workspaces whose sessions should be preloaded;
+                None preloads recently-active sessions across all workspaces
+            limit: Maximum number of sessions to load
+
+        Returns:
+            Number of sessions loaded into memory
+        """
+        try:
+            if workspace_ids is not None:
+                query = text("""
+                    SELECT id, agent_id, workspace_id, user_id, customer_id,
+                           mode, status, started_at, last_activity_at, metadata
+                    FROM parlant_session
+                    WHERE workspace_id IN :workspace_ids
+                    AND status = 'active'
+                    AND started_at > NOW() - INTERVAL '24 hours'
+                    ORDER BY last_activity_at DESC
+                    LIMIT :lim
+                """).bindparams(bindparam('workspace_ids', expanding=True))
+                params = {'workspace_ids': list(workspace_ids), 'lim': limit}
+            else:
+                # No explicit scope: recent activity is the scope
+                query = text("""
+                    SELECT id, agent_id, workspace_id, user_id, customer_id,
+                           mode, status, started_at, last_activity_at, metadata
+                    FROM parlant_session
+                    WHERE status = 'active'
+                    AND started_at > NOW() - INTERVAL '24 hours'
+                    ORDER BY last_activity_at DESC
+                    LIMIT :lim
+                """)
+                params = {'lim': limit}
+
+            results = self.db_session.execute(query, params)
+
+            loaded = 0
+            for row in results:
+                if row.id in self._isolated_sessions:
+                    continue
+
+                isolated_session = IsolatedSession(
+                    session_id=row.id,
+                    agent_id=row.agent_id,
+                    workspace_id=row.workspace_id,
+                    user_id=row.user_id,
+                    customer_id=row.customer_id,
+                    isolation_config=SessionIsolationConfig(),
+                    created_at=row.started_at,
+                    last_activity=row.last_activity_at or row.started_at,
+                    is_active=True,
+                    metadata=row.metadata or {}
+                )
+
+                self._isolated_sessions[row.id] = isolated_session
+                self._session_workspace_map[row.id] = row.workspace_id
+                loaded += 1
+
+            logger.info(f"Warmed up {loaded} isolated sessions in one bulk load")
+            return loaded
+
+        except Exception as e:
+            logger.error(f"Error warming up isolated sessions: {e}")
+            return 0
+
     async def validate_session_access(
         self,
         session_id: str,
@@ -195,41 +329,54 @@ class SessionIsolationManager:
             if not isolated_session:
                 return False
 
-            # Check if session is expired
-            if isolated_session.is_expired:
-                logger.warning(f"Access denied to expired session {session_id}")
-                return False
-
-            # Get workspace context for the requesting user
-            workspace_context = await self.context_manager.isolation_manager.get_workspace_context(
-                requesting_user_id, isolated_session.workspace_id
+            return await self._check_session_access(
+                isolated_session, requesting_user_id, required_permission
             )
 
-            if not workspace_context:
-                return False
-
-            # Check permission based on conversation scope
-            if isolated_session.isolation_config.conversation_scope == ConversationScope.USER_PRIVATE:
-                # Only the creating user can access
-                return requesting_user_id == isolated_session.user_id
-            elif isolated_session.isolation_config.conversation_scope == ConversationScope.WORKSPACE_PRIVATE:
-                # Workspace members with appropriate permissions
-                if required_permission == 'read' and workspace_context.can_read:
-                    return True
-                elif required_permission == 'write' and workspace_context.can_write:
-                    return True
-                elif required_permission == 'admin' and workspace_context.can_admin:
-                    return True
-            elif isolated_session.isolation_config.conversation_scope == ConversationScope.WORKSPACE_SHARED:
-                # Any workspace member can access
-                return workspace_context.can_read
+        except Exception as e:
+            logger.error("Error validating session access: %s", e)
+            return False
 
+    async def _check_session_access(
+        self,
+        isolated_session: IsolatedSession,
+        requesting_user_id: str,
+        required_permission: str = 'read'
+    ) -> bool:
+        """Check access against an already-fetched session (no session lookup)."""
+        # Check if session is expired
+        if isolated_session.is_expired:
+            logger.warning("Access denied to expired session %s", isolated_session.session_id)
             return False
 
-        except Exception as e:
-            logger.error(f"Error validating session access: {e}")
+        # USER_PRIVATE only depends on ownership - decide without fetching
+        # the workspace context at all
+        if isolated_session.isolation_config.conversation_scope == ConversationScope.USER_PRIVATE:
+            return requesting_user_id == isolated_session.user_id
+
+        # Get workspace context for the requesting user
+        workspace_context = await self.context_manager.isolation_manager.get_workspace_context(
+            requesting_user_id, isolated_session.workspace_id
+        )
+
+        if not workspace_context:
             return False
 
+        # Check permission based on conversation scope
+        if isolated_session.isolation_config.conversation_scope == ConversationScope.WORKSPACE_PRIVATE:
+            # Workspace members with appropriate permissions
+            if required_permission == 'read' and workspace_context.can_read:
+                return True
+            elif required_permission == 'write' and workspace_context.can_write:
+                return True
+            elif required_permission == 'admin' and workspace_context.can_admin:
+                return True
+        elif isolated_session.isolation_config.conversation_scope == ConversationScope.WORKSPACE_SHARED:
+            # Any workspace member can access
+            return workspace_context.can_read
+
+        return False
+
     async def get_session_event_filter(
         self,
         session_id: str,
@@ -245,31 +392,36 @@ class SessionIsolationManager:
         Returns:
             SQL WHERE clause for event filtering
         """
-        # Check cache first
-        cache_key = f"{session_id}:{user_id}"
-        if cache_key in self._event_filter_cache:
-            return self._event_filter_cache[cache_key]
-
-        # Validate session access
-        has_access = await self.validate_session_access(session_id, user_id)
-        if not has_access:
-            filter_clause = "1=0"  # No access - return impossible condition
+        # Reuse a recent access decision if one is cached - this skips the
+        # workspace-context fetch that dominates the repeat-poll path
+        cache_key = (session_id, user_id)
+        now = time.time()
+        cached = self._access_decision_cache.get(cache_key)
+        if cached is not None and now < cached[1]:
+            has_access = cached[0]
         else:
-            # Get workspace for additional filtering
-            workspace_id = self._session_workspace_map.get(session_id)
-            if workspace_id:
-                filter_clause = (
-                    f"e.session_id = '{session_id}' AND "
-                    f"s.workspace_id = '{workspace_id}' AND "
-                    f"s.id = e.session_id"
-                )
-            else:
-                filter_clause = f"e.session_id = '{session_id}'"
-
-        # Cache the filter
-        self._event_filter_cache[cache_key] = filter_clause
+            # Validate session access (single session fetch, reused for check)
+            isolated_session = await self._get_isolated_session(session_id)
+            has_access = (
+                isolated_session is not None
+                and await self._check_session_access(isolated_session, user_id)
+            )
+            self._access_decision_cache[cache_key] = (
+                has_access, now + self._access_decision_ttl
+            )
 
-        return filter_clause
+        if not has_access:
+            return "1=0"  # No access - return impossible condition
+
+        # SQL templating is pure formatting - not worth caching
+        workspace_id = self._session_workspace_map.get(session_id)
+        if workspace_id:
+            return (
+                f"e.session_id = '{session_id}' AND "
+                f"s.workspace_id = '{workspace_id}' AND "
+                f"s.id = e.session_id"
+            )
+        return f"e.session_id = '{session_id}'"
 
     async def get_filtered_conversation_history(
         self,
@@ -305,10 +457,12 @@ class SessionIsolationManager:
                 f"WHERE {event_filter}"
             ]
 
-            # Add event type filter if specified
+            # Add event type filter if specified - a single expanding IN bind
+            # instead of interpolating an OR chain of raw strings
+            params: Dict[str, Any] = {}
             if event_types:
-                type_filter = "(" + " OR ".join([f"e.event_type = '{et}'" for et in event_types]) + ")"
-                query_parts.append(f"AND {type_filter}")
+                query_parts.append("AND e.event_type IN :event_types")
+                params['event_types'] = list(event_types)
 
             # Add ordering and pagination
             query_parts.extend([
@@ -317,24 +471,14 @@ class SessionIsolationManager:
             ])
 
             query = text(" ".join(query_parts))
-            results = self.db_session.execute(query).fetchall()
+            if event_types:
+                query = query.bindparams(bindparam('event_types', expanding=True))
+            results = self.db_session.execute(query, params).fetchall()
 
-            # Convert to dictionaries
-            events = []
-            for row in results:
-                event = {
-                    'id': row.id,
-                    'event_type': row.event_type,
-                    'content': row.content,
-                    'metadata': row.metadata,
-                    'created_at': row.created_at.isoformat() if row.created_at else None,
-                    'tool_call_id': row.tool_call_id,
-                    'journey_id': row.journey_id,
-                    'state_id': row.state_id
-                }
-                events.append(event)
-
-            return events
+            # Materialize rows via the C-level ._mapping proxy instead of
+            # assembling each dict key-by-key. Datetimes are left intact for
+            # the response layer, where orjson serializes them natively.
+            return [dict(row._mapping) for row in results]
 
         except Exception as e:
             logger.error(f"Error getting filtered conversation history: {e}")
@@ -360,17 +504,15 @@ class SessionIsolationManager:
             True if event creation is allowed, False otherwise
         """
         try:
-            # Validate session access with write permission
-            has_write_access = await self.validate_session_access(session_id, user_id, 'write')
-            if not has_write_access:
-                logger.warning(f"User {user_id} lacks write access to session {session_id}")
-                return False
-
-            # Get isolated session for additional validation
+            # Fetch the session once and reuse it for the access check
             isolated_session = await self._get_isolated_session(session_id)
             if not isolated_session:
                 return False
 
+            if not await self._check_session_access(isolated_session, user_id, 'write'):
+                logger.warning("User %s lacks write access to session %s", user_id, session_id)
+                return False
+
             # Validate workspace-specific constraints
             if isolated_session.isolation_config.isolation_level == SessionIsolationLevel.STRICT:
                 # In strict mode, validate all content references are workspace-scoped
@@ -393,14 +535,16 @@ class SessionIsolationManager:
             return True
 
         except Exception as e:
-            logger.error(f"Error validating event creation: {e}")
+            logger.error("Error validating event creation: %s", e)
             return False
 
     async def get_user_accessible_sessions(
         self,
         user_id: str,
         workspace_id: Optional[str] = None,
-        include_inactive: bool = False
+        include_inactive: bool = False,
+        limit: int = 100,
+        offset: int = 0
     ) -> List[Dict[str, Any]]:
         """
         Get all sessions accessible to a user.
@@ -409,90 +553,66 @@ class SessionIsolationManager:
             user_id: User ID
             workspace_id: Optional workspace filter
             include_inactive: Include inactive sessions
+            limit: Maximum number of sessions to return
+            offset: Offset for pagination
 
         Returns:
             List of accessible session information
         """
         try:
-            # Build base query
-            query_parts = [
-                "SELECT s.id, s.agent_id, s.workspace_id, s.user_id, s.customer_id,",
-                "       s.title, s.status, s.mode, s.started_at, s.last_activity_at,",
-                "       s.message_count, s.event_count,",
-                "       a.name as agent_name, a.description as agent_description",
-                "FROM parlant_session s",
-                "JOIN parlant_agent a ON s.agent_id = a.id",
-                "WHERE 1=1"
+            # Pick the precompiled statement variant - avoids re-assembling
+            # and re-parsing the SQL on every call. Access validation happens
+            # in SQL via a lateral permission probe so the response is bounded
+            # and no post-fetch filtering loop is needed.
+            query = self._accessible_sessions_stmts[
+                (workspace_id is not None, not include_inactive)
             ]
 
-            params = {'user_id': user_id}
-
-            # Add workspace filter
+            params = {'user_id': user_id, 'lim': limit, 'off': offset}
             if workspace_id:
-                query_parts.append("AND s.workspace_id = :workspace_id")
                 params['workspace_id'] = workspace_id
 
-            # Add status filter
-            if not include_inactive:
-                query_parts.append("AND s.status = 'active'")
-
-            # Add user access conditions based on isolation rules
-            query_parts.append("""
-                AND (
-                    s.user_id = :user_id OR
-                    EXISTS (
-                        SELECT 1 FROM permissions p
-                        WHERE p.user_id = :user_id
-                        AND p.entity_type = 'workspace'
-                        AND p.entity_id = s.workspace_id
-                        AND p.permission_type IN ('read', 'write', 'admin')
-                    )
-                )
-            """)
-
-            query_parts.append("ORDER BY s.last_activity_at DESC")
+            results = self.db_session.execute(query, params)
 
-            query = text(" ".join(query_parts))
-            results = self.db_session.execute(query, params).fetchall()
-
-            # Convert to dictionaries and add isolation info
-            sessions = []
-            for row in results:
-                session_info = {
-                    'id': row.id,
-                    'agent_id': row.agent_id,
-                    'workspace_id': row.workspace_id,
-                    'user_id': row.user_id,
-                    'customer_id': row.customer_id,
-                    'title': row.title,
-                    'status': row.status,
-                    'mode': row.mode,
-                    'started_at': row.started_at.isoformat() if row.started_at else None,
-                    'last_activity_at': row.last_activity_at.isoformat() if row.last_activity_at else None,
-                    'message_count': row.message_count,
-                    'event_count': row.event_count,
-                    'agent_name': row.agent_name,
-                    'agent_description': row.agent_description,
-                    'is_owner': row.user_id == user_id
-                }
-
-                # Add isolation info if session is in memory
-                if row.id in self._isolated_sessions:
-                    isolated_session = self._isolated_sessions[row.id]
-                    session_info.update({
-                        'isolation_level': isolated_session.isolation_config.isolation_level.value,
-                        'conversation_scope': isolated_session.isolation_config.conversation_scope.value,
-                        'isolation_token': isolated_session.isolation_token
-                    })
-
-                sessions.append(session_info)
-
-            return sessions
+            # Single pass over the cursor - no intermediate row list
+            return [self._session_row_to_dict(row, user_id) for row in results]
 
         except Exception as e:
             logger.error(f"Error getting accessible sessions for user {user_id}: {e}")
             return []
 
+    def _session_row_to_dict(self, row: Any, user_id: str) -> Dict[str, Any]:
+        """Convert an accessible-session row to response dict with isolation info."""
+        session_info = {
+            'id': row.id,
+            'agent_id': row.agent_id,
+            'workspace_id': row.workspace_id,
+            'user_id': row.user_id,
+            'customer_id': row.customer_id,
+            'title': row.title,
+            'status': row.status,
+            'mode': row.mode,
+            'started_at': row.started_at.isoformat() if row.started_at else None,
+            'last_activity_at': row.last_activity_at.isoformat() if row.last_activity_at else None,
+            'message_count': row.message_count,
+            'event_count': row.event_count,
+            'agent_name': row.agent_name,
+            'agent_description': row.agent_description,
+            'is_owner': row.user_id == user_id
+        }
+
+        # Add isolation info if session is in memory
+        isolated_session = self._isolated_sessions.get(row.id)
+        if isolated_session:
+            config = isolated_session.isolation_config
+            session_info.update({
+                'isolation_level': config._level_str,
+                'conversation_scope': config._scope_str,
+                'isolation_token': isolated_session.isolation_token
+            })
+
+        return session_info
+
     async def enforce_conversation_boundaries(
         self,
         session_id: str,
@@ -513,19 +633,21 @@ class SessionIsolationManager:
             True if operation is allowed within boundaries, False otherwise
         """
         try:
-            # Get isolated session
+            # Fetch the session once and reuse it for all access checks
             isolated_session = await self._get_isolated_session(session_id)
             if not isolated_session:
                 return False
 
             # Validate basic session access
-            if not await self.validate_session_access(session_id, requesting_user_id):
+            if not await self._check_session_access(isolated_session, requesting_user_id):
                 return False
 
             # Check operation-specific boundaries
             if operation in ['create_message', 'update_message']:
                 # Message operations require write access
-                return await self.validate_session_access(session_id, requesting_user_id, 'write')
+                return await self._check_session_access(
+                    isolated_session, requesting_user_id, 'write'
+                )
 
             elif operation == 'execute_tool':
                 # Tool execution validation
@@ -540,40 +662,42 @@ class SessionIsolationManager:
 
             elif operation == 'update_journey_state':
                 # Journey updates require write access
-                return await self.validate_session_access(session_id, requesting_user_id, 'write')
+                return await self._check_session_access(
+                    isolated_session, requesting_user_id, 'write'
+                )
 
             return True
 
         except Exception as e:
-            logger.error(f"Error enforcing conversation boundaries: {e}")
+            logger.error("Error enforcing conversation boundaries: %s", e)
             return False
 
     async def cleanup_expired_sessions(self):
         """Clean up expired sessions and related data."""
-        current_time = datetime.now()
-        expired_sessions = []
-
         # Find expired sessions
-        for session_id, isolated_session in self._isolated_sessions.items():
-            if isolated_session.is_expired:
-                expired_sessions.append(session_id)
+        expired_sessions = [
+            session_id
+            for session_id, isolated_session in self._isolated_sessions.items()
+            if isolated_session.is_expired
+        ]
+
+        if not expired_sessions:
+            return
 
         # Clean up expired sessions
         for session_id in expired_sessions:
             await self._cleanup_expired_session(session_id)
 
-        # Clear expired cache entries
-        expired_cache_keys = []
-        for key in list(self._event_filter_cache.keys()):
-            # Remove cache entries for expired sessions
-            if any(key.startswith(f"{sess_id}:") for sess_id in expired_sessions):
-                expired_cache_keys.append(key)
+        # Purge cache entries for expired sessions in a single pass with O(1)
+        # set membership per key instead of O(expired) prefix comparisons
+        expired_set = frozenset(expired_sessions)
+        self._access_decision_cache = {
+            key: value
+            for key, value in self._access_decision_cache.items()
+            if key[0] not in expired_set
+        }
 
-        for key in expired_cache_keys:
-            del self._event_filter_cache[key]
-
-        if expired_sessions:
-            logger.info(f"Cleaned up {len(expired_sessions)} expired isolated sessions")
+        logger.info(f"Cleaned up {len(expired_sessions)} expired isolated sessions")
 
     # Private helper methods
 
@@ -589,7 +713,7 @@ class SessionIsolationManager:
         """Create database record for isolated session."""
         # Note: This would integrate with the actual parlant_session table
         # For now, we'll just log the creation
-        logger.debug(f"Created database record for session {isolated_session.session_id}")
+        logger.debug("Created database record for session %s", isolated_session.session_id)
 
     async def _load_session_from_database(self, session_id: str) -> Optional[IsolatedSession]:
         """Load session from database and recreate isolated session."""
@@ -635,17 +759,19 @@ class SessionIsolationManager:
         workspace_id: str
     ) -> bool:
         """Validate that event content doesn't reference cross-workspace resources."""
-        # Check for tool references
-        if 'tool_id' in event_content:
-            tool_workspace = await self._get_tool_workspace(event_content['tool_id'])
-            if tool_workspace and tool_workspace != workspace_id:
-                return False
+        # Tool and journey lookups are independent - resolve them concurrently
+        tool_workspace, journey_workspace = await asyncio.gather(
+            self._get_tool_workspace(event_content['tool_id'])
+            if 'tool_id' in event_content else _none(),
+            self._get_journey_workspace(event_content['journey_id'])
+            if 'journey_id' in event_content else _none()
+        )
 
-        # Check for journey references
-        if 'journey_id' in event_content:
-            journey_workspace = await self._get_journey_workspace(event_content['journey_id'])
-            if journey_workspace and journey_workspace != workspace_id:
-                return False
+        if tool_workspace and tool_workspace != workspace_id:
+            return False
+
+        if journey_workspace and journey_workspace != workspace_id:
+            return False
 
         return True
 
@@ -668,7 +794,7 @@ class SessionIsolationManager:
         if session_id in self._session_workspace_map:
             del self._session_workspace_map[session_id]
 
-        logger.debug(f"Cleaned up expired session {session_id}")
+        logger.debug("Cleaned up expired session %s", session_id)
 
     # Database query helpers
 
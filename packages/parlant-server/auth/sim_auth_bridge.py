@@ -4,24 +4,88 @@ Integrates with Better Auth system to validate Sim users for Parlant agents
 """
 
 import asyncio
+import hashlib
 import logging
+import pickle
+import time
+from operator import itemgetter
 import httpx
-import json
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
-from dataclasses import dataclass
+import orjson
+import structlog
+from typing import Awaitable, Callable, Dict, Any, FrozenSet, Optional, List
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, field
 
 import jwt
+from cachetools import TTLCache
 from fastapi import HTTPException
 from jose import JWTError
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from jose import jwt as jose_jwt
+
+try:
+    import ijson
+except ImportError:  # Streaming JSON parse is optional
+    ijson = None
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:  # Shared L2 session cache is optional
+    aioredis = None
 
 from config.settings import Settings
 
+# NOTE: workspace lookups go through the Sim HTTP API. If a direct-DB
+# fallback is ever added here, use asyncpg (non-blocking, low per-query
+# overhead) rather than the synchronous SQLAlchemy ORM on this hot path.
+
 
 logger = logging.getLogger(__name__)
 
+# Workspace fields forwarded to consumers; pulled in one C call per entry
+_WS_KEYS = ("id", "name", "role", "permissions", "owner_id", "created_at")
+_ws_fields = itemgetter(*_WS_KEYS)
+
+# Workspace payloads above this size are parsed incrementally instead of
+# being buffered whole and then parsed (which doubles peak memory)
+_LARGE_WS_PAYLOAD_BYTES = 64 * 1024
+
+
+class _AsyncByteReader:
+    """Minimal async file-like adapter over an httpx byte iterator for ijson."""
+
+    def __init__(self, byte_iterator):
+        self._iterator = byte_iterator
+        self._buffer = b""
+
+    async def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            chunks = [self._buffer]
+            self._buffer = b""
+            async for chunk in self._iterator:
+                chunks.append(chunk)
+            return b"".join(chunks)
+
+        while len(self._buffer) < size:
+            try:
+                self._buffer += await self._iterator.__anext__()
+            except StopAsyncIteration:
+                break
+
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _parse_iso8601(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp from the Sim API.
+
+    Python 3.11+ parses a trailing 'Z' natively; the replace() fallback only
+    runs on older interpreters.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
 
 @dataclass
 class SimUser:
@@ -35,10 +99,25 @@ class SimUser:
     updated_at: datetime
     active_organization_id: Optional[str] = None
     workspaces: List[Dict[str, Any]] = None
+    # Precomputed id set for O(1) workspace membership checks on the
+    # per-request authorization path
+    workspace_ids: FrozenSet[str] = field(default_factory=frozenset)
+    # Whether workspaces were actually fetched - they load lazily, so an
+    # empty list can also mean "not loaded yet"
+    workspaces_loaded: bool = field(default=False, init=False)
 
     def __post_init__(self):
         if self.workspaces is None:
             self.workspaces = []
+        else:
+            # Constructed with explicit workspaces (tests, enriched contexts)
+            self.workspaces_loaded = True
+
+    def set_workspaces(self, workspaces: List[Dict[str, Any]]):
+        """Assign workspaces and rebuild the membership id set."""
+        self.workspaces = workspaces
+        self.workspace_ids = frozenset(w["id"] for w in workspaces)
+        self.workspaces_loaded = True
 
 
 @dataclass
@@ -51,6 +130,110 @@ class SimSession:
     ip_address: Optional[str]
     user_agent: Optional[str]
     active_organization_id: Optional[str]
+    # Pre-formatted expiry and memoized Parlant context - both immutable for
+    # the session's lifetime, rebuilt per call otherwise
+    expires_at_iso: str = field(init=False)
+    # Expiry as Unix seconds so the cache hot path does a float compare via
+    # time.time() (vDSO) instead of a datetime.now() allocation per lookup
+    expires_at_ts: float = field(init=False)
+    _parlant_ctx: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    # Async workspace loader attached by the bridge; invoked on first access
+    # so auth paths that never touch workspaces skip the fetch entirely
+    _workspace_loader: Optional[
+        Callable[[str], Awaitable[List[Dict[str, Any]]]]
+    ] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.expires_at_iso = self.expires_at.isoformat()
+        self.expires_at_ts = self.expires_at.timestamp()
+
+    async def ensure_workspaces(self) -> List[Dict[str, Any]]:
+        """Load the user's workspaces on first access (lazy)."""
+        if not self.user.workspaces_loaded and self._workspace_loader is not None:
+            self.user.set_workspaces(await self._workspace_loader(self.user.id))
+        return self.user.workspaces
+
+    def __getstate__(self):
+        # The lazy loader is bound to a live bridge and cannot travel
+        # through the shared L2 cache; the bridge reattaches it on read.
+        # The raw bearer token must never be stored in Redis - the reader
+        # already holds the presented token and reattaches it
+        state = self.__dict__.copy()
+        state["_workspace_loader"] = None
+        state["token"] = None
+        return state
+
+
+class _WorkspaceBatchFetcher:
+    """
+    Coalesces workspace lookups arriving within a short window into one
+    batched API call.
+
+    When M users authenticate in the same burst, the naive path fires M
+    separate workspace fetches; micro-batching turns those into a single
+    POST. Falls back (permanently, per process) to single-user fetches
+    when the Sim deployment lacks the batch endpoint.
+    """
+
+    # How long to wait for more lookups before flushing the batch
+    _FLUSH_WINDOW = 0.005  # seconds
+
+    def __init__(self, bridge: "SimAuthBridge"):
+        self._bridge = bridge
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_scheduled = False
+        self._batch_supported = True
+
+    async def get(self, user_id: str) -> List[Dict[str, Any]]:
+        """Resolve one user's workspaces, sharing a batch with peers."""
+        if not self._batch_supported:
+            return await self._bridge._fetch_user_workspaces(user_id)
+
+        loop = asyncio.get_event_loop()
+        future = self._pending.get(user_id)
+        if future is None:
+            future = loop.create_future()
+            self._pending[user_id] = future
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                loop.call_later(
+                    self._FLUSH_WINDOW,
+                    lambda: loop.create_task(self._flush())
+                )
+        return await future
+
+    async def _flush(self) -> None:
+        """Issue one batched fetch and distribute results to waiters."""
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        user_ids = list(pending)
+        try:
+            if len(user_ids) == 1:
+                # No peers showed up inside the window - plain single fetch
+                results = {
+                    user_ids[0]:
+                        await self._bridge._fetch_user_workspaces(user_ids[0])
+                }
+            else:
+                results = await self._bridge._fetch_workspaces_batch(user_ids)
+                if results is None:
+                    self._batch_supported = False
+                    singles = await asyncio.gather(
+                        *(self._bridge._fetch_user_workspaces(uid) for uid in user_ids)
+                    )
+                    results = dict(zip(user_ids, singles))
+        except Exception as e:
+            # Fetchers swallow their own errors; this is belt-and-braces so
+            # a bug here can never strand waiters
+            logger.error("Workspace batch flush failed: %s", e)
+            results = {}
+
+        for user_id, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(user_id, []))
 
 
 class SimAuthBridge:
@@ -70,9 +253,46 @@ class SimAuthBridge:
         self._jwt_secret = settings.jwt_secret_key
         self._jwt_algorithm = settings.jwt_algorithm
 
-        # Cache for validated sessions (in-memory cache)
-        self._session_cache: Dict[str, SimSession] = {}
+        # Cache for validated sessions, keyed by a fixed-width hash of the
+        # token so raw bearer tokens never sit in a process-wide dict and
+        # long JWT strings aren't re-hashed per lookup. Bounded LRU + TTL so
+        # token churn cannot grow the cache without limit; entries whose
+        # session expires before the TTL are rejected on lookup.
         self._cache_ttl = timedelta(minutes=5)  # Cache sessions for 5 minutes
+        self._session_cache: TTLCache = TTLCache(
+            maxsize=settings.auth_cache_size,
+            ttl=self._cache_ttl.total_seconds()
+        )
+
+        # Short-lived user -> workspaces cache so bursts of validations for
+        # the same user reuse one workspace fetch instead of one per session
+        self._workspaces_cache: TTLCache = TTLCache(maxsize=2048, ttl=60)
+
+        # Bound concurrent outbound workspace fetches so an auth surge
+        # cannot open hundreds of simultaneous requests and starve the
+        # connection pool
+        self._ws_sem = asyncio.Semaphore(
+            getattr(settings, "auth_max_concurrent", 50) or 50
+        )
+
+        # Coalesces workspace lookups from concurrent logins into one
+        # batched API call
+        self._ws_batcher = _WorkspaceBatchFetcher(self)
+
+        # In-flight validations by cache key so concurrent requests carrying
+        # the same token share one backend fetch (single-flight)
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+
+        # Short-TTL negative cache so replayed invalid tokens are rejected
+        # locally instead of hammering the Sim API (token-spray deflection)
+        self._negative_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+        self._negative_ttl = 30
+
+        # Optional Redis-backed L2 session cache so a validation done by one
+        # worker process is visible to the rest (multi-worker deployments
+        # otherwise get a cold L1 per worker). Connected in initialize()
+        self._redis = None
+        self._redis_prefix = getattr(settings, "redis_key_prefix", "parlant:")
 
     async def initialize(self):
         """Initialize the authentication bridge."""
@@ -89,6 +309,15 @@ class SimAuthBridge:
         self.http_client = httpx.AsyncClient(
             base_url=self.settings.get_sim_base_url(),
             timeout=timeout_config,
+            # HTTP/2 lets the concurrent session + workspace fetches
+            # multiplex over one TCP/TLS connection; the limits bump avoids
+            # pool starvation under burst
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=50,
+                max_connections=200,
+                keepalive_expiry=60
+            ),
             headers={
                 "User-Agent": "Parlant-Server/1.0.0",
                 "Accept": "application/json",
@@ -96,6 +325,18 @@ class SimAuthBridge:
             }
         )
 
+        # Connect the shared L2 session cache; degrade to L1-only when Redis
+        # is not installed, not configured, or unreachable
+        redis_url = getattr(self.settings, "redis_url", None)
+        if aioredis is not None and redis_url:
+            try:
+                self._redis = aioredis.from_url(redis_url)
+                await self._redis.ping()
+                logger.info("Connected Redis L2 session cache")
+            except Exception as e:
+                logger.warning("Redis L2 session cache unavailable: %s", e)
+                self._redis = None
+
         # Test connection to Sim API
         await self._test_sim_connection()
         logger.info("Sim Authentication Bridge initialized successfully")
@@ -105,6 +346,9 @@ class SimAuthBridge:
         if self.http_client:
             await self.http_client.aclose()
             self.http_client = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
 
     async def _test_sim_connection(self) -> bool:
         """Test connectivity to Sim's authentication endpoints."""
@@ -115,10 +359,10 @@ class SimAuthBridge:
                 logger.info("✅ Successfully connected to Sim API")
                 return True
             else:
-                logger.warning(f"⚠️ Sim API returned status {response.status_code}")
+                logger.warning("⚠️ Sim API returned status %s", response.status_code)
                 return False
         except Exception as e:
-            logger.error(f"❌ Failed to connect to Sim API: {e}")
+            logger.error("❌ Failed to connect to Sim API: %s", e)
             # Don't fail initialization, but log the error
             return False
 
@@ -132,41 +376,284 @@ class SimAuthBridge:
         Returns:
             SimSession if valid, None otherwise
         """
-        # Check cache first
-        if token in self._session_cache:
-            cached_session = self._session_cache[token]
-            if cached_session.expires_at > datetime.now():
-                logger.debug(f"Session cache hit for token: {token[:8]}...")
-                return cached_session
-            else:
-                # Remove expired session from cache
-                del self._session_cache[token]
+        # Check cache first (L1 in-process, then shared L2)
+        cache_key = self._token_key(token)
+        cached_session = await self._cache_get(cache_key, token)
+        if cached_session is not None:
+            logger.debug("Session cache hit for token: %.8s...", token)
+            return cached_session
+
+        # Recently-rejected token - deny without touching the backend
+        if await self._negative_cache_check(cache_key):
+            logger.debug("Negative cache hit for invalid token")
+            return None
+
+        # Single-flight: if another coroutine is already validating this
+        # token, await its result instead of issuing a duplicate fetch
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            return await inflight
 
+        future: asyncio.Future = asyncio.get_event_loop().create_future()
+        self._inflight[cache_key] = future
         try:
-            # Call Sim's session validation endpoint
-            response = await self.http_client.get(
+            session = await self._validate_token_uncached(token)
+            future.set_result(session)
+            return session
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._inflight[cache_key]
+
+    async def _validate_token_uncached(self, token: str) -> Optional[SimSession]:
+        """Validate a token that missed the cache (local JWT or Sim API)."""
+        # JWTs are self-contained - verify the signature and expiry locally
+        # and skip the /api/auth/session round-trip entirely
+        try:
+            claims = self._try_local_jwt_decode(token)
+        except JWTError:
+            claims = None  # Opaque token - fall through to the Sim API
+
+        if claims is not None:
+            if not self._is_session_jwt(claims):
+                # Signed with our secret but not a login session (workspace/
+                # exchange/service tokens share the signing key) - never
+                # mint an authenticated session from one
+                logger.debug(
+                    "Rejected non-session JWT on auth path (type=%s)",
+                    claims.get("type")
+                )
+                return None
+            try:
+                return await self._session_from_jwt_claims(claims, token)
+            except Exception as e:
+                logger.error("Error building session from JWT claims: %s", e)
+                return None
+
+        # Peek at the unverified `sub` claim so the workspace fetch can start
+        # concurrently with the session validation round-trip
+        peek_user_id = None
+        try:
+            peek_user_id = jose_jwt.get_unverified_claims(token).get("sub")
+        except JWTError:
+            pass
+
+        try:
+            # Call Sim's session validation endpoint; when we know the user id
+            # up front, fetch workspaces in parallel instead of serially after
+            session_task = self.http_client.get(
                 "/api/auth/session",
                 headers={"Authorization": f"Bearer {token}"}
             )
 
+            prefetched_workspaces = None
+            if peek_user_id:
+                response, prefetched_workspaces = await asyncio.gather(
+                    session_task, self._get_user_workspaces(peek_user_id)
+                )
+            else:
+                response = await session_task
+
             if response.status_code == 200:
-                session_data = response.json()
-                return await self._parse_sim_session(session_data, token)
+                # orjson decodes the payload several times faster than the
+                # stdlib parser behind response.json()
+                session_data = orjson.loads(response.content)
+                return await self._parse_sim_session(
+                    session_data, token,
+                    prefetched_workspaces=prefetched_workspaces,
+                    prefetched_user_id=peek_user_id
+                )
             elif response.status_code == 401:
                 logger.debug("Invalid or expired session token")
+                # Remember the rejection briefly so replays are shed locally
+                await self._negative_cache_put(self._token_key(token))
                 return None
             else:
-                logger.error(f"Unexpected response from Sim auth API: {response.status_code}")
+                logger.error("Unexpected response from Sim auth API: %s", response.status_code)
                 return None
 
         except httpx.RequestError as e:
-            logger.error(f"Network error validating session: {e}")
+            logger.error("Network error validating session: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Error validating session token: {e}")
+            logger.error("Error validating session token: %s", e)
+            return None
+
+    @staticmethod
+    def _token_key(token: str) -> bytes:
+        """Derive the fixed-width session cache key for a bearer token."""
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def _redis_key(self, kind: str, cache_key: bytes) -> str:
+        """Build the namespaced Redis key for a hashed token."""
+        return f"{self._redis_prefix}auth:{kind}:{cache_key.hex()}"
+
+    async def _cache_get(self, cache_key: bytes, token: str) -> Optional[SimSession]:
+        """Look up a cached session: L1 dict first, then shared Redis L2."""
+        session = self._session_cache.get(cache_key)
+        if session is not None:
+            if session.expires_at_ts > time.time():
+                return session
+            # Remove expired session from cache
+            del self._session_cache[cache_key]
+
+        if self._redis is None:
             return None
 
-    async def _parse_sim_session(self, session_data: Dict[str, Any], token: str) -> SimSession:
+        try:
+            raw = await self._redis.get(self._redis_key("session", cache_key))
+        except Exception as e:
+            logger.debug("Redis session cache read failed: %s", e)
+            return None
+
+        if not raw:
+            return None
+
+        session = pickle.loads(raw)
+        if session.expires_at_ts <= time.time():
+            return None
+
+        # Promote to L1 so repeat hits on this worker stay in-process;
+        # reattach the lazy workspace loader and the presented bearer
+        # token, both stripped before pickling
+        session._workspace_loader = self._get_user_workspaces
+        session.token = token
+        self._session_cache[cache_key] = session
+        return session
+
+    async def _cache_set(self, cache_key: bytes, session: SimSession) -> None:
+        """Write-through a validated session to L1 and the shared L2."""
+        self._session_cache[cache_key] = session
+
+        if self._redis is None:
+            return
+
+        # Never cache past the session's own expiry
+        ttl = int(min(
+            self._cache_ttl.total_seconds(),
+            session.expires_at_ts - time.time()
+        ))
+        if ttl <= 0:
+            return
+        try:
+            await self._redis.setex(
+                self._redis_key("session", cache_key), ttl, pickle.dumps(session)
+            )
+        except Exception as e:
+            logger.debug("Redis session cache write failed: %s", e)
+
+    async def _negative_cache_check(self, cache_key: bytes) -> bool:
+        """Check whether this token was recently rejected (L1, then L2)."""
+        if cache_key in self._negative_cache:
+            return True
+        if self._redis is None:
+            return False
+        try:
+            if await self._redis.get(self._redis_key("rejected", cache_key)):
+                self._negative_cache[cache_key] = True
+                return True
+        except Exception as e:
+            logger.debug("Redis negative cache read failed: %s", e)
+        return False
+
+    async def _negative_cache_put(self, cache_key: bytes) -> None:
+        """Record a rejected token in both cache levels."""
+        self._negative_cache[cache_key] = True
+        if self._redis is None:
+            return
+        try:
+            await self._redis.setex(
+                self._redis_key("rejected", cache_key), self._negative_ttl, b"1"
+            )
+        except Exception as e:
+            logger.debug("Redis negative cache write failed: %s", e)
+
+    @staticmethod
+    def _is_session_jwt(claims: Dict[str, Any]) -> bool:
+        """
+        Whether locally-verified claims describe a Better Auth login session.
+
+        Several credential types in this package are signed with the same
+        shared secret - workspace tokens from AuthenticationUtils and the
+        session/workspace/exchange tokens minted by TokenExchangeService.
+        Those all carry a `type` claim and an internal issuer/audience and
+        must never be converted into authenticated sessions. A genuine
+        session JWT identifies its user via a non-empty `sub` and carries
+        none of the service-token markers.
+        """
+        if not claims.get("sub"):
+            return False
+        if claims.get("type") is not None:
+            return False
+        # We decode with verify_aud disabled, so any audience present is
+        # unvalidated and treated as foreign
+        if claims.get("aud") is not None:
+            return False
+        if claims.get("iss") == "sim-parlant-bridge":
+            return False
+        return True
+
+    def _try_local_jwt_decode(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a JWT's signature and expiry locally.
+
+        Returns the claims dict on success; raises JWTError when the token is
+        opaque or the signature/expiry check fails.
+        """
+        return jose_jwt.decode(
+            token,
+            self._jwt_secret,
+            algorithms=[self._jwt_algorithm],
+            options={"verify_aud": False}
+        )
+
+    async def _session_from_jwt_claims(self, claims: Dict[str, Any], token: str) -> SimSession:
+        """Build a SimSession directly from locally-verified JWT claims."""
+        now = datetime.now(timezone.utc)
+
+        user = SimUser(
+            id=claims.get("sub"),
+            name=claims.get("name", ""),
+            email=claims.get("email", ""),
+            email_verified=claims.get("email_verified", False),
+            image=claims.get("picture"),
+            created_at=datetime.fromtimestamp(claims["iat"], tz=timezone.utc) if "iat" in claims else now,
+            updated_at=datetime.fromtimestamp(claims["updatedAt"], tz=timezone.utc) if "updatedAt" in claims else now,
+        )
+
+        expires_at = (
+            datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
+            if "exp" in claims else now + self._cache_ttl
+        )
+
+        session = SimSession(
+            id=claims.get("jti", f"jwt_{user.id}"),
+            user=user,
+            expires_at=expires_at,
+            token=token,
+            ip_address=None,
+            user_agent=None,
+            active_organization_id=claims.get("activeOrganizationId")
+        )
+
+        # Workspaces are not in the token - fetched lazily from the Sim API
+        # on first access
+        session._workspace_loader = self._get_user_workspaces
+
+        # Cache the session
+        await self._cache_set(self._token_key(token), session)
+
+        logger.info("Validated session locally for user %s (ID: %s)", user.email, user.id)
+        return session
+
+    async def _parse_sim_session(
+        self,
+        session_data: Dict[str, Any],
+        token: str,
+        prefetched_workspaces: Optional[List[Dict[str, Any]]] = None,
+        prefetched_user_id: Optional[str] = None
+    ) -> SimSession:
         """Parse Sim session data into SimSession object."""
         user_data = session_data.get("user", {})
         session_info = session_data.get("session", {})
@@ -178,15 +665,17 @@ class SimAuthBridge:
             email=user_data.get("email", ""),
             email_verified=user_data.get("emailVerified", False),
             image=user_data.get("image"),
-            created_at=datetime.fromisoformat(user_data.get("createdAt").replace("Z", "+00:00")),
-            updated_at=datetime.fromisoformat(user_data.get("updatedAt").replace("Z", "+00:00")),
+            created_at=_parse_iso8601(user_data.get("createdAt")),
+            updated_at=_parse_iso8601(user_data.get("updatedAt")),
         )
 
-        # Get user's workspaces
-        user.workspaces = await self._get_user_workspaces(user.id)
+        # Use the concurrently-fetched workspaces when they belong to this
+        # user; otherwise defer the fetch until something actually reads them
+        if prefetched_workspaces is not None and prefetched_user_id == user.id:
+            user.set_workspaces(prefetched_workspaces)
 
         # Parse session info
-        expires_at = datetime.fromisoformat(session_info.get("expiresAt").replace("Z", "+00:00"))
+        expires_at = _parse_iso8601(session_info.get("expiresAt"))
 
         session = SimSession(
             id=session_info.get("id"),
@@ -197,55 +686,137 @@ class SimAuthBridge:
             user_agent=session_info.get("userAgent"),
             active_organization_id=session_info.get("activeOrganizationId")
         )
+        session._workspace_loader = self._get_user_workspaces
 
         # Cache the session
-        self._session_cache[token] = session
+        await self._cache_set(self._token_key(token), session)
 
-        logger.info(f"Validated session for user {user.email} (ID: {user.id})")
+        logger.info("Validated session for user %s (ID: %s)", user.email, user.id)
         return session
 
     async def _get_user_workspaces(self, user_id: str) -> List[Dict[str, Any]]:
         """Get list of workspaces for a user from Sim database."""
+        # Reuse a recent fetch for the same user (e.g. several sessions of
+        # one user authenticating within the cache window)
+        cached_workspaces = self._workspaces_cache.get(user_id)
+        if cached_workspaces is not None:
+            return cached_workspaces
+
+        # Coalesce with other lookups arriving inside the batch window
+        return await self._ws_batcher.get(user_id)
+
+    @staticmethod
+    def _transform_workspaces(raw_workspaces: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Normalize raw workspace entries to the forwarded field set.
+
+        itemgetter pulls all forwarded fields in one C call per entry; the
+        per-key .get() loop only runs when optional fields are missing
+        upstream.
+        """
+        try:
+            return [
+                dict(zip(_WS_KEYS, _ws_fields(workspace)))
+                for workspace in raw_workspaces
+            ]
+        except KeyError:
+            return [
+                {
+                    "id": workspace["id"],
+                    "name": workspace["name"],
+                    "role": workspace.get("role", "member"),
+                    "permissions": workspace.get("permissions", ["read"]),
+                    "owner_id": workspace.get("owner_id"),
+                    "created_at": workspace.get("created_at"),
+                }
+                for workspace in raw_workspaces
+            ]
+
+    async def _fetch_user_workspaces(self, user_id: str) -> List[Dict[str, Any]]:
+        """Fetch one user's workspaces from the Sim API (cache write-through)."""
         try:
-            # Call Sim API to get user's workspaces with permissions
-            response = await self.http_client.get(
+            # Call Sim API to get user's workspaces with permissions.
+            # Streaming keeps the response body out of memory until we know
+            # how big it is
+            async with self._ws_sem, self.http_client.stream(
+                "GET",
                 f"/api/v1/users/{user_id}/workspaces",
                 headers={"Authorization": f"Bearer {self._jwt_secret}"}  # Internal auth
-            )
-
-            if response.status_code == 200:
-                workspaces_data = response.json()
-
-                # Transform the workspace data to include permissions
-                workspaces = []
-                for workspace in workspaces_data.get("workspaces", []):
-                    workspace_info = {
-                        "id": workspace["id"],
-                        "name": workspace["name"],
-                        "role": workspace.get("role", "member"),
-                        "permissions": workspace.get("permissions", ["read"]),
-                        "owner_id": workspace.get("owner_id"),
-                        "created_at": workspace.get("created_at"),
-                    }
-                    workspaces.append(workspace_info)
-
-                logger.debug(f"Found {len(workspaces)} workspaces for user {user_id}")
-                return workspaces
-
-            elif response.status_code == 404:
-                logger.info(f"No workspaces found for user {user_id}")
-                return []
-            else:
-                logger.error(f"Failed to fetch workspaces: {response.status_code}")
-                return []
+            ) as response:
+                if response.status_code == 200:
+                    content_length = int(response.headers.get("content-length") or 0)
+                    if ijson is not None and content_length > _LARGE_WS_PAYLOAD_BYTES:
+                        # Oversized payloads are parsed incrementally so the
+                        # raw body and the parsed objects never coexist
+                        raw_workspaces = [
+                            workspace
+                            async for workspace in ijson.items(
+                                _AsyncByteReader(response.aiter_bytes()),
+                                "workspaces.item",
+                            )
+                        ]
+                    else:
+                        workspaces_data = orjson.loads(await response.aread())
+                        raw_workspaces = workspaces_data.get("workspaces", [])
+
+                    # Transform the workspace data to include permissions
+                    workspaces = self._transform_workspaces(raw_workspaces)
+
+                    logger.debug("Found %d workspaces for user %s", len(workspaces), user_id)
+                    self._workspaces_cache[user_id] = workspaces
+                    return workspaces
+
+                elif response.status_code == 404:
+                    logger.info("No workspaces found for user %s", user_id)
+                    self._workspaces_cache.pop(user_id, None)
+                    return []
+                else:
+                    logger.error("Failed to fetch workspaces: %s", response.status_code)
+                    return []
 
         except httpx.RequestError as e:
-            logger.error(f"Network error fetching workspaces for user {user_id}: {e}")
+            logger.error("Network error fetching workspaces for user %s: %s", user_id, e)
             return []
         except Exception as e:
-            logger.error(f"Error fetching workspaces for user {user_id}: {e}")
+            logger.error("Error fetching workspaces for user %s: %s", user_id, e)
             return []
 
+    async def _fetch_workspaces_batch(
+        self, user_ids: List[str]
+    ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Fetch several users' workspace lists in one batched API call.
+
+        Returns a user_id -> workspaces mapping, or None when the Sim API
+        does not expose the batch endpoint (caller falls back to singles).
+        """
+        try:
+            async with self._ws_sem:
+                response = await self.http_client.post(
+                    "/api/v1/users/workspaces:batch",
+                    json={"user_ids": user_ids},
+                    headers={"Authorization": f"Bearer {self._jwt_secret}"}  # Internal auth
+                )
+        except httpx.RequestError as e:
+            logger.error("Network error batch-fetching workspaces: %s", e)
+            return {user_id: [] for user_id in user_ids}
+
+        if response.status_code in (404, 405, 501):
+            # Batch endpoint not available on this Sim deployment
+            return None
+        if response.status_code != 200:
+            logger.error("Batch workspace fetch failed: %s", response.status_code)
+            return {user_id: [] for user_id in user_ids}
+
+        payload = orjson.loads(response.content)
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        for user_id, raw_workspaces in payload.get("results", {}).items():
+            workspaces = self._transform_workspaces(raw_workspaces)
+            self._workspaces_cache[user_id] = workspaces
+            results[user_id] = workspaces
+
+        logger.debug("Batch-fetched workspaces for %d users", len(user_ids))
+        return {user_id: results.get(user_id, []) for user_id in user_ids}
+
     async def validate_workspace_access(
         self,
         session: SimSession,
@@ -261,26 +832,52 @@ class SimAuthBridge:
         Returns:
             True if user has access, False otherwise
         """
-        user_workspaces = session.user.workspaces
+        # Workspaces load lazily - fetch them now if nothing has yet
+        await session.ensure_workspaces()
 
-        for workspace in user_workspaces:
-            if workspace["id"] == workspace_id:
-                logger.debug(f"User {session.user.email} has access to workspace {workspace_id}")
-                return True
+        # O(1) membership test against the precomputed id set; fall back to
+        # deriving it for sessions whose user was constructed directly
+        workspace_ids = session.user.workspace_ids or frozenset(
+            w["id"] for w in session.user.workspaces
+        )
 
-        logger.warning(f"User {session.user.email} denied access to workspace {workspace_id}")
+        if workspace_id in workspace_ids:
+            logger.debug("User %s has access to workspace %s", session.user.email, workspace_id)
+            return True
+
+        logger.warning("User %s denied access to workspace %s", session.user.email, workspace_id)
         return False
 
-    def create_parlant_user_context(self, session: SimSession) -> Dict[str, Any]:
+    async def create_parlant_user_context(
+        self,
+        session: SimSession,
+        include_workspaces: bool = True
+    ) -> Dict[str, Any]:
         """
         Create Parlant user context from Sim session.
 
         Args:
             session: Validated SimSession
+            include_workspaces: Load workspace data into the context; pass
+                False for callers that never read it to skip the lazy fetch
 
         Returns:
             User context dictionary for Parlant agents
         """
+        if not include_workspaces and session._parlant_ctx is None:
+            # Don't trigger the workspace load or memoize the partial result
+            return self._build_user_context(session)
+
+        # The full context is immutable for the session's lifetime - build
+        # once and reuse on every subsequent agent request
+        if session._parlant_ctx is None:
+            await session.ensure_workspaces()
+            session._parlant_ctx = self._build_user_context(session)
+        return session._parlant_ctx
+
+    @staticmethod
+    def _build_user_context(session: SimSession) -> Dict[str, Any]:
+        """Assemble the user context dict from whatever is loaded."""
         return {
             "user_id": session.user.id,
             "email": session.user.email,
@@ -290,7 +887,7 @@ class SimAuthBridge:
             "active_organization_id": session.active_organization_id,
             "workspaces": session.user.workspaces,
             "session_id": session.id,
-            "expires_at": session.expires_at.isoformat(),
+            "expires_at": session.expires_at_iso,
         }
 
     async def create_agent_session_context(
@@ -319,7 +916,7 @@ class SimAuthBridge:
 
         context = {
             "session_id": f"parlant_{session.id}_{workspace_id}",
-            "user_context": self.create_parlant_user_context(session),
+            "user_context": await self.create_parlant_user_context(session),
             "workspace_id": workspace_id,
             "agent_id": agent_id,
             "created_at": datetime.now().isoformat(),
@@ -370,16 +967,26 @@ class SimAuthBridge:
         if not token:
             return None
 
-        return await self.validate_session_token(token)
+        session = await self.validate_session_token(token)
+
+        if session is not None:
+            # Bind the request's auth context once; structlog-aware handlers
+            # attach it to every downstream log line without re-interpolation
+            structlog.contextvars.bind_contextvars(
+                user_id=session.user.id,
+                session_id=session.id,
+            )
+
+        return session
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get session cache statistics."""
         active_sessions = 0
         expired_sessions = 0
-        now = datetime.now()
+        now = time.time()
 
         for session in self._session_cache.values():
-            if session.expires_at > now:
+            if session.expires_at_ts > now:
                 active_sessions += 1
             else:
                 expired_sessions += 1
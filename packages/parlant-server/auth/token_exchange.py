@@ -3,23 +3,42 @@ Secure Token Exchange System
 Manages token exchange between Sim and Parlant server with session consistency
 """
 
+import asyncio
 import logging
-import secrets
 import hashlib
-import json
+import os
+import threading
+import time
 from typing import Dict, Any, Optional, List, Tuple
-from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 
-import redis
-from jose import jwt, JWTError
+import base64
+
+import orjson
+from cachetools import TTLCache
+from redis import asyncio as aioredis
+from jose import jwk, jwt, JWTError
 from cryptography.fernet import Fernet
 from fastapi import HTTPException
 
+try:
+    # Rust-backed Fernet: same primitive, several times faster per
+    # encrypt/decrypt and far less allocator pressure
+    from rfernet import Fernet as _RustFernet
+except ImportError:  # Optional - pyca/cryptography remains the fallback
+    _RustFernet = None
+
 from auth.sim_auth_bridge import SimSession
 from config.settings import Settings, get_settings
 
+_fernet_cls = _RustFernet or Fernet
+
+# Derived-key memo keyed by (secret, salt): PBKDF2 at 100k iterations
+# costs 50-150ms, which otherwise recurs on every service construction
+# (per worker boot, per test instantiation)
+_KEY_CACHE: Dict[Tuple[bytes, bytes], bytes] = {}
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,26 +50,75 @@ class TokenType(Enum):
     EXCHANGE_TOKEN = "exchange_token"
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenMetadata:
     """Metadata associated with a token."""
     token_id: str
     token_type: TokenType
     user_id: str
     workspace_id: Optional[str]
-    issued_at: datetime
-    expires_at: datetime
+    issued_at: float  # Unix epoch seconds
+    expires_at: float  # Unix epoch seconds
     permissions: List[str]
     metadata: Dict[str, Any]
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat serializable dict.
+
+        dataclasses.asdict deep-copies every field recursively; for this
+        known-flat shape a dict literal is several times cheaper.
+        """
+        return {
+            "token_id": self.token_id,
+            "token_type": self.token_type.value,
+            "user_id": self.user_id,
+            "workspace_id": self.workspace_id,
+            "issued_at": self.issued_at,
+            "expires_at": self.expires_at,
+            "permissions": self.permissions,
+            "metadata": self.metadata,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TokenMetadata":
+        """Inverse of to_dict."""
+        return cls(
+            token_id=data["token_id"],
+            token_type=TokenType(data["token_type"]),
+            user_id=data["user_id"],
+            workspace_id=data["workspace_id"],
+            issued_at=data["issued_at"],
+            expires_at=data["expires_at"],
+            permissions=data["permissions"],
+            metadata=data["metadata"],
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class SessionToken:
-    """Secure session token with encrypted payload."""
+    """Secure session token.
+
+    A single signed JWT is the whole credential; sensitive claims live
+    only in the Redis-side metadata, which is the authoritative copy.
+    """
     token: str
-    encrypted_payload: str
-    signature: str
-    expires_at: datetime
+    expires_at: float  # Unix epoch seconds
+
+
+# Server-side GET + sliding EXPIRE in one EVALSHA round-trip. The TTL is
+# only ever raised (to ARGV[1]) when the remaining TTL is lower, so
+# long-lived API-token metadata is never shortened; absolute validity is
+# still enforced against the stored expires_at by every caller.
+_TOUCH_SCRIPT = """
+local v = redis.call('GET', KEYS[1])
+if v then
+    local ttl = redis.call('TTL', KEYS[1])
+    if ttl >= 0 and ttl < tonumber(ARGV[1]) then
+        redis.call('EXPIRE', KEYS[1], ARGV[1])
+    end
+end
+return v
+"""
 
 
 class TokenExchangeService:
@@ -60,18 +128,51 @@ class TokenExchangeService:
         self.settings = settings or get_settings()
         self._redis_client = None
         self._encryption_key = self._derive_encryption_key()
+        # Fernet (either backend) expects the urlsafe-base64 form of the key.
+        # Built once; session tokens are plain signed JWTs now, so this only
+        # backs encryption of sensitive blobs at rest (none on the hot path)
+        self._fernet_key = base64.urlsafe_b64encode(self._encryption_key)
+        self._fernet = _fernet_cls(self._fernet_key)
+        # Pre-encoded secret for any HMAC use without a per-call str.encode()
+        self._hmac_key = self.settings.jwt_secret_key.encode()
+
+        # Pre-constructed JWK so jose skips rebuilding the HMAC key object
+        # (prepare_key + algorithm lookup) on every encode/decode
+        self._jwt_key = jwk.construct(
+            self.settings.jwt_secret_key, self.settings.jwt_algorithm
+        )
 
-        # Token configuration
-        self.session_token_ttl = timedelta(hours=24)
-        self.workspace_token_ttl = timedelta(hours=12)
-        self.api_token_ttl = timedelta(days=30)
-        self.exchange_token_ttl = timedelta(minutes=5)
+        # Token configuration (seconds). Plain integers keep all expiry
+        # math in epoch-float arithmetic - no datetime/timedelta objects
+        # allocated per token operation
+        self.session_token_ttl = 24 * 3600
+        self.workspace_token_ttl = 12 * 3600
+        self.api_token_ttl = 30 * 86400
+        self.exchange_token_ttl = 5 * 60
+
+        # Process-local metadata cache: metadata is immutable between
+        # issuance and revocation, so re-presented tokens skip the Redis
+        # round-trip entirely. Short TTL bounds the revocation window;
+        # the pub/sub listener below closes it across workers
+        self._metadata_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+        self._revocation_task: Optional[asyncio.Task] = None
+
+        # Sliding floor (seconds) for metadata keys of actively-presented
+        # tokens; applied server-side by _TOUCH_SCRIPT
+        self._metadata_slide_ttl = 300
+        self._touch_script = None
+
+        # Entropy buffer for token ids: one os.urandom syscall covers 128
+        # ids. Lock, not async primitive - _generate_token_id is sync and
+        # the critical section is a memcpy
+        self._entropy_buf = bytearray()
+        self._entropy_lock = threading.Lock()
 
     @property
     def redis_client(self):
         """Get Redis client instance."""
         if self._redis_client is None:
-            self._redis_client = redis.from_url(
+            self._redis_client = aioredis.from_url(
                 self.settings.redis_url,
                 decode_responses=True,
                 socket_connect_timeout=5,
@@ -84,17 +185,22 @@ class TokenExchangeService:
     def _derive_encryption_key(self) -> bytes:
         """Derive encryption key from JWT secret."""
         # Use PBKDF2 to derive a proper encryption key
-        import hashlib
-        import os
-
         salt = b'parlant_token_salt'  # In production, use a proper random salt
-        key = hashlib.pbkdf2_hmac(
-            'sha256',
-            self.settings.jwt_secret_key.encode(),
-            salt,
-            100000,  # iterations
-            32  # key length
-        )
+        secret = self.settings.jwt_secret_key.encode()
+
+        # The derivation is deterministic in (secret, salt), so repeated
+        # instantiation reuses the module-level memo instead of re-running
+        # 100k PBKDF2 iterations
+        key = _KEY_CACHE.get((secret, salt))
+        if key is None:
+            key = hashlib.pbkdf2_hmac(
+                'sha256',
+                secret,
+                salt,
+                100000,  # iterations
+                32  # key length
+            )
+            _KEY_CACHE[(secret, salt)] = key
         return key
 
     async def create_session_token(
@@ -106,45 +212,34 @@ class TokenExchangeService:
         """Create a secure session token for Parlant integration."""
 
         token_id = self._generate_token_id()
-        now = datetime.utcnow()
+        now = time.time()
         expires_at = now + self.session_token_ttl
 
-        # Create token payload
+        # Create token payload. PII (email, name) stays out of the token -
+        # it lives in the Redis-side metadata, which is authoritative
         payload = {
             "jti": token_id,
             "type": TokenType.SESSION_TOKEN.value,
             "user_id": session.user.id,
-            "user_email": session.user.email,
-            "user_name": session.user.name,
             "session_id": session.id,
             "workspace_id": workspace_id,
             "permissions": permissions or [],
-            "iat": now.timestamp(),
-            "exp": expires_at.timestamp(),
+            "iat": now,
+            "exp": expires_at,
             "iss": "sim-parlant-bridge",
             "aud": "parlant-server"
         }
 
-        # Encrypt sensitive data
-        fernet = Fernet(self._encryption_key)
-        encrypted_payload = fernet.encrypt(json.dumps(payload).encode())
-
-        # Create JWT token
+        # One signed JWT is the whole credential - the previous flow
+        # Fernet-encrypted the payload AND issued a second JWT AND HMACed
+        # the pair, i.e. four MAC operations where one suffices
         token = jwt.encode(
-            {"jti": token_id, "type": "encrypted_session"},
-            self.settings.jwt_secret_key,
+            payload,
+            self._jwt_key,
             algorithm=self.settings.jwt_algorithm
         )
 
-        # Create signature for integrity
-        signature = self._create_token_signature(token, encrypted_payload)
-
-        session_token = SessionToken(
-            token=token,
-            encrypted_payload=encrypted_payload.decode(),
-            signature=signature,
-            expires_at=expires_at
-        )
+        session_token = SessionToken(token=token, expires_at=expires_at)
 
         # Store token metadata in Redis
         await self._store_token_metadata(token_id, TokenMetadata(
@@ -169,37 +264,23 @@ class TokenExchangeService:
         """Validate and decrypt a session token."""
 
         try:
-            # Verify JWT token
-            token_data = jwt.decode(
+            # One signature verification covers the whole credential
+            payload = jwt.decode(
                 session_token.token,
-                self.settings.jwt_secret_key,
-                algorithms=[self.settings.jwt_algorithm]
+                self._jwt_key,
+                algorithms=[self.settings.jwt_algorithm],
+                audience="parlant-server"
             )
 
-            token_id = token_data.get("jti")
+            token_id = payload.get("jti")
             if not token_id:
                 return None
 
-            # Check token metadata in Redis
+            # Check token metadata in Redis (revocation + authoritative TTL)
             metadata = await self._get_token_metadata(token_id)
-            if not metadata or metadata.expires_at < datetime.utcnow():
-                return None
-
-            # Verify signature
-            expected_signature = self._create_token_signature(
-                session_token.token,
-                session_token.encrypted_payload.encode()
-            )
-
-            if not secrets.compare_digest(session_token.signature, expected_signature):
-                logger.warning(f"Token signature verification failed for token {token_id}")
+            if not metadata or metadata.expires_at < time.time():
                 return None
 
-            # Decrypt payload
-            fernet = Fernet(self._encryption_key)
-            decrypted_payload = fernet.decrypt(session_token.encrypted_payload.encode())
-            payload = json.loads(decrypted_payload.decode())
-
             logger.debug(f"Validated session token for user {payload.get('user_id')}")
             return payload
 
@@ -216,7 +297,7 @@ class TokenExchangeService:
         """Create a workspace-scoped token."""
 
         token_id = self._generate_token_id()
-        now = datetime.utcnow()
+        now = time.time()
         expires_at = now + self.workspace_token_ttl
 
         payload = {
@@ -225,15 +306,15 @@ class TokenExchangeService:
             "user_id": session.user.id,
             "workspace_id": workspace_id,
             "permissions": permissions,
-            "iat": now.timestamp(),
-            "exp": expires_at.timestamp(),
+            "iat": now,
+            "exp": expires_at,
             "iss": "sim-parlant-bridge",
             "aud": "parlant-server"
         }
 
         token = jwt.encode(
             payload,
-            self.settings.jwt_secret_key,
+            self._jwt_key,
             algorithm=self.settings.jwt_algorithm
         )
 
@@ -261,7 +342,7 @@ class TokenExchangeService:
         """Create a short-lived exchange token for service-to-service auth."""
 
         token_id = self._generate_token_id()
-        now = datetime.utcnow()
+        now = time.time()
         expires_at = now + self.exchange_token_ttl
 
         payload = {
@@ -270,15 +351,15 @@ class TokenExchangeService:
             "user_id": session.user.id,
             "target_service": target_service,
             "scope": scope,
-            "iat": now.timestamp(),
-            "exp": expires_at.timestamp(),
+            "iat": now,
+            "exp": expires_at,
             "iss": "sim-parlant-bridge",
             "aud": target_service
         }
 
         token = jwt.encode(
             payload,
-            self.settings.jwt_secret_key,
+            self._jwt_key,
             algorithm=self.settings.jwt_algorithm
         )
 
@@ -311,8 +392,8 @@ class TokenExchangeService:
                 logger.warning(f"User {user_id} attempted to revoke token {token_id} owned by {metadata.user_id}")
                 return False
 
-            # Remove from Redis
-            await self._delete_token_metadata(token_id)
+            # Remove from Redis (metadata already loaded - skip the refetch)
+            await self._delete_token_metadata(token_id, metadata)
 
             logger.info(f"Revoked token {token_id} for user {user_id}")
             return True
@@ -334,8 +415,7 @@ class TokenExchangeService:
             return None
 
         # Check if refresh is needed (less than 2 hours remaining)
-        time_remaining = current_token.expires_at - datetime.utcnow()
-        if time_remaining > timedelta(hours=2):
+        if current_token.expires_at - time.time() > 2 * 3600:
             return current_token
 
         # Create new token
@@ -354,20 +434,41 @@ class TokenExchangeService:
         """Get list of active tokens for a user."""
 
         try:
-            # In production, this would use a more efficient pattern scan
-            pattern = f"{self.settings.redis_key_prefix}token:*"
-            keys = self.redis_client.keys(pattern)
+            # The per-user SET index makes this O(tokens of this user)
+            # instead of a KEYS scan over the whole keyspace
+            prefix = self.settings.redis_key_prefix
+            token_ids = list(
+                await self.redis_client.smembers(self._user_index_key(user_id))
+            )
+
+            if token_ids:
+                keys = [f"{prefix}token:{token_id}" for token_id in token_ids]
+            else:
+                # Tokens minted before the index existed: fall back to a
+                # cursor-based SCAN, which never blocks the server the way
+                # KEYS does. Indexed tokens make this path rare
+                keys = [key async for key in self.redis_client.scan_iter(
+                    match=f"{prefix}token:*", count=500
+                )]
+                token_ids = [key.rsplit(":", 1)[-1] for key in keys]
+
+            # MGET fetches every metadata blob in a single command - one
+            # round-trip with none of the pipeline bookkeeping
+            values = await self.redis_client.mget(keys) if keys else []
 
             active_tokens = []
-            for key in keys:
-                try:
-                    data = self.redis_client.get(key)
-                    if data:
-                        metadata = TokenMetadata(**json.loads(data))
-                        if metadata.user_id == user_id and metadata.expires_at > datetime.utcnow():
-                            active_tokens.append(metadata)
-                except Exception as e:
-                    logger.warning(f"Error parsing token metadata from {key}: {e}")
+            stale_ids = []
+            for token_id, data in zip(token_ids, values):
+                metadata = self._parse_token_metadata(data) if data else None
+                if metadata is None:
+                    # Token expired out of Redis; prune it from the index
+                    stale_ids.append(token_id)
+                elif (metadata.user_id == user_id
+                      and metadata.expires_at > time.time()):
+                    active_tokens.append(metadata)
+
+            if stale_ids:
+                await self.redis_client.srem(self._user_index_key(user_id), *stale_ids)
 
             return active_tokens
 
@@ -378,56 +479,135 @@ class TokenExchangeService:
     # Private helper methods
 
     def _generate_token_id(self) -> str:
-        """Generate a unique token identifier."""
-        return secrets.token_urlsafe(32)
+        """Generate a unique token identifier.
+
+        Equivalent to secrets.token_urlsafe(32), but sliced from a
+        pre-pulled os.urandom buffer so the random-pool syscall is
+        amortized over 128 ids instead of paid per token.
+        """
+        with self._entropy_lock:
+            if len(self._entropy_buf) < 32:
+                self._entropy_buf += os.urandom(4096)
+            raw = bytes(self._entropy_buf[:32])
+            del self._entropy_buf[:32]
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    def _user_index_key(self, user_id: str) -> str:
+        """Redis SET of token ids issued to a user."""
+        return f"{self.settings.redis_key_prefix}user_tokens:{user_id}"
+
+    def _session_index_key(self, session_id: str) -> str:
+        """Redis SET of token ids issued against a Sim session."""
+        return f"{self.settings.redis_key_prefix}session_tokens:{session_id}"
+
+    def _store_token_metadata_pipeline(
+        self, pipe, token_id: str, metadata: TokenMetadata
+    ):
+        """Enqueue the metadata write and index maintenance on a pipeline.
 
-    def _create_token_signature(self, token: str, encrypted_payload: bytes) -> str:
-        """Create HMAC signature for token integrity."""
-        import hmac
+        Takes a caller-owned pipeline so flows that touch Redis more than
+        once per token (create + sync, bulk issuance) can fold everything
+        into a single execute/round-trip.
+        """
+        key = f"{self.settings.redis_key_prefix}token:{token_id}"
+        ttl_seconds = int(metadata.expires_at - time.time())
 
-        message = f"{token}:{encrypted_payload.decode()}"
-        signature = hmac.new(
-            self.settings.jwt_secret_key.encode(),
-            message.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        # Index TTL is bumped to the longest token lifetime; stale members
+        # are pruned on read
+        index_ttl = self.api_token_ttl
+        pipe.setex(key, ttl_seconds, orjson.dumps(metadata.to_dict()))
+        pipe.sadd(self._user_index_key(metadata.user_id), token_id)
+        pipe.expire(self._user_index_key(metadata.user_id), index_ttl)
 
-        return signature
+        session_id = metadata.metadata.get("session_id")
+        if session_id:
+            pipe.sadd(self._session_index_key(session_id), token_id)
+            pipe.expire(self._session_index_key(session_id), index_ttl)
 
     async def _store_token_metadata(self, token_id: str, metadata: TokenMetadata):
-        """Store token metadata in Redis."""
-        key = f"{self.settings.redis_key_prefix}token:{token_id}"
-        ttl_seconds = int((metadata.expires_at - datetime.utcnow()).total_seconds())
-
-        self.redis_client.setex(
-            key,
-            ttl_seconds,
-            json.dumps(asdict(metadata), default=str)
-        )
+        """Store token metadata in Redis and index it by user and session."""
+        # One pipeline, one round-trip for the whole write set
+        pipe = self.redis_client.pipeline(transaction=False)
+        self._store_token_metadata_pipeline(pipe, token_id, metadata)
+        await pipe.execute()
 
     async def _get_token_metadata(self, token_id: str) -> Optional[TokenMetadata]:
-        """Get token metadata from Redis."""
+        """Get token metadata, preferring the in-process cache over Redis."""
+        cached = self._metadata_cache.get(token_id)
+        if cached is not None:
+            return cached
+
+        # Make sure cross-worker revocations invalidate this cache before
+        # the first entry goes in
+        self._ensure_revocation_listener()
+
+        # One EVALSHA does the read and refreshes the key's TTL atomically,
+        # collapsing the GET + EXPIRE pair into a single round-trip
+        if self._touch_script is None:
+            self._touch_script = self.redis_client.register_script(_TOUCH_SCRIPT)
+
         key = f"{self.settings.redis_key_prefix}token:{token_id}"
-        data = self.redis_client.get(key)
+        data = await self._touch_script(
+            keys=[key], args=[self._metadata_slide_ttl]
+        )
 
         if data:
-            try:
-                metadata_dict = json.loads(data)
-                # Convert datetime strings back to datetime objects
-                metadata_dict['issued_at'] = datetime.fromisoformat(metadata_dict['issued_at'])
-                metadata_dict['expires_at'] = datetime.fromisoformat(metadata_dict['expires_at'])
-                metadata_dict['token_type'] = TokenType(metadata_dict['token_type'])
-                return TokenMetadata(**metadata_dict)
-            except Exception as e:
-                logger.error(f"Error parsing token metadata: {e}")
-                return None
-
+            metadata = self._parse_token_metadata(data)
+            if metadata is not None:
+                self._metadata_cache[token_id] = metadata
+            return metadata
         return None
 
-    async def _delete_token_metadata(self, token_id: str):
-        """Delete token metadata from Redis."""
+    def _revocation_channel(self) -> str:
+        """Pub/sub channel carrying revoked token ids."""
+        return f"{self.settings.redis_key_prefix}token:revoked"
+
+    def _ensure_revocation_listener(self):
+        """Start the revocation subscriber once per process."""
+        if self._revocation_task is None or self._revocation_task.done():
+            self._revocation_task = asyncio.get_event_loop().create_task(
+                self._listen_for_revocations()
+            )
+
+    async def _listen_for_revocations(self):
+        """Drop cached metadata when any worker revokes a token."""
+        try:
+            pubsub = self.redis_client.pubsub()
+            await pubsub.subscribe(self._revocation_channel())
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    self._metadata_cache.pop(message.get("data"), None)
+        except Exception as e:
+            logger.warning(f"Token revocation listener stopped: {e}")
+
+    @staticmethod
+    def _parse_token_metadata(data) -> Optional[TokenMetadata]:
+        """Deserialize a stored metadata blob back into TokenMetadata."""
+        try:
+            return TokenMetadata.from_dict(orjson.loads(data))
+        except Exception as e:
+            logger.error(f"Error parsing token metadata: {e}")
+            return None
+
+    async def _delete_token_metadata(
+        self, token_id: str, metadata: Optional[TokenMetadata] = None
+    ):
+        """Delete token metadata from Redis and unindex it."""
+        if metadata is None:
+            metadata = await self._get_token_metadata(token_id)
+
+        # Evict locally and broadcast so other workers' caches follow
+        self._metadata_cache.pop(token_id, None)
+
         key = f"{self.settings.redis_key_prefix}token:{token_id}"
-        self.redis_client.delete(key)
+        await self.redis_client.delete(key)
+        await self.redis_client.publish(self._revocation_channel(), token_id)
+
+        if metadata is not None:
+            await self.redis_client.srem(self._user_index_key(metadata.user_id), token_id)
+            session_id = metadata.metadata.get("session_id")
+            if session_id:
+                await self.redis_client.srem(self._session_index_key(session_id), token_id)
 
 
 class SessionConsistencyManager:
@@ -450,17 +630,17 @@ class SessionConsistencyManager:
             "parlant_session_id": parlant_session_id,
             "user_id": sim_session.user.id,
             "context_data": context_data,
-            "last_sync": datetime.utcnow().isoformat(),
+            "last_sync": time.time(),
             "expires_at": sim_session.expires_at.isoformat()
         }
 
         key = f"{self.token_service.settings.redis_key_prefix}session_sync:{sim_session.id}"
-        ttl_seconds = int((sim_session.expires_at - datetime.utcnow()).total_seconds())
+        ttl_seconds = int(sim_session.expires_at.timestamp() - time.time())
 
-        self.redis_client.setex(
+        await self.redis_client.setex(
             key,
             ttl_seconds,
-            json.dumps(sync_data)
+            orjson.dumps(sync_data)
         )
 
         logger.debug(f"Synced session state for session {sim_session.id}")
@@ -469,10 +649,10 @@ class SessionConsistencyManager:
         """Get synchronized session data."""
 
         key = f"{self.token_service.settings.redis_key_prefix}session_sync:{sim_session_id}"
-        data = self.redis_client.get(key)
+        data = await self.redis_client.get(key)
 
         if data:
-            return json.loads(data)
+            return orjson.loads(data)
 
         return None
 
@@ -481,21 +661,38 @@ class SessionConsistencyManager:
 
         # Remove session sync data
         sync_key = f"{self.token_service.settings.redis_key_prefix}session_sync:{session_id}"
-        self.redis_client.delete(sync_key)
-
-        # Revoke associated tokens
-        pattern = f"{self.token_service.settings.redis_key_prefix}token:*"
-        keys = self.redis_client.keys(pattern)
-
-        for key in keys:
-            try:
-                data = self.redis_client.get(key)
-                if data:
-                    metadata = json.loads(data)
-                    if metadata.get("metadata", {}).get("session_id") == session_id:
-                        self.redis_client.delete(key)
-            except Exception as e:
-                logger.warning(f"Error checking token for session invalidation: {e}")
+        await self.redis_client.delete(sync_key)
+
+        # Revoke associated tokens via the per-session index - O(tokens of
+        # this session) instead of scanning every token in the keyspace
+        session_index = self.token_service._session_index_key(session_id)
+        token_ids = await self.redis_client.smembers(session_index)
+
+        prefix = self.token_service.settings.redis_key_prefix
+        if token_ids:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for token_id in token_ids:
+                self.token_service._metadata_cache.pop(token_id, None)
+                pipe.delete(f"{prefix}token:{token_id}")
+                pipe.publish(self.token_service._revocation_channel(), token_id)
+            pipe.delete(session_index)
+            await pipe.execute()
+        else:
+            # Pre-index tokens: cursor-based SCAN fallback (non-blocking,
+            # unlike KEYS), then one MGET for all candidates instead of a
+            # GET per key, filtering on the stored session id
+            keys = [key async for key in self.redis_client.scan_iter(
+                match=f"{prefix}token:*", count=500
+            )]
+            values = await self.redis_client.mget(keys) if keys else []
+            for key, data in zip(keys, values):
+                try:
+                    if data:
+                        metadata = orjson.loads(data)
+                        if metadata.get("metadata", {}).get("session_id") == session_id:
+                            await self.redis_client.delete(key)
+                except Exception as e:
+                    logger.warning(f"Error checking token for session invalidation: {e}")
 
         logger.info(f"Invalidated session {session_id}")
 
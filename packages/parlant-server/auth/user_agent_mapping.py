@@ -3,23 +3,92 @@ User-to-Agent Mapping Service
 Handles context passing and permission management between Sim users and Parlant agents
 """
 
+import asyncio
+import functools
+import heapq
 import logging
+import sys
+import time
 from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from dataclasses import dataclass, field
+
+from cachetools import TTLCache
 
 from sqlalchemy import select, and_, or_
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from auth.sim_auth_bridge import SimSession, SimUser
-from auth.utils import AuthenticationUtils, AgentPermissions, WorkspacePermissions
+from auth.utils import (
+    AuthenticationUtils,
+    AgentPermissions,
+    WorkspacePermissions,
+    PERM_READ,
+    PERM_WRITE,
+    PERM_DELETE,
+)
 from config.settings import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# Tool categories for permission checking. Frozensets give O(1)
+# membership tests; the reverse map classifies a tool in one lookup
+_READ_TOOLS = frozenset({
+    "search_knowledge_base",
+    "get_user_info",
+    "list_files",
+    "read_document",
+})
+
+_WRITE_TOOLS = frozenset({
+    "create_document",
+    "update_document",
+    "send_email",
+    "create_task",
+})
+
+_DELETE_TOOLS = frozenset({
+    "delete_document",
+    "delete_task",
+    "remove_user",
+})
+
+# Required permission mask per tool; unknown tools require nothing
+_TOOL_PERM_BITS: Dict[str, int] = {
+    **{tool: PERM_READ for tool in _READ_TOOLS},
+    **{tool: PERM_WRITE for tool in _WRITE_TOOLS},
+    **{tool: PERM_DELETE for tool in _DELETE_TOOLS},
+}
+
+_MISSING = object()
+
+# Allowed tools and restricted actions precomputed for every permission
+# combination, so context builds share immutable tuples instead of
+# re-extending fresh lists per call
+_ALLOWED_TOOLS_BY_PERMS: Dict[Tuple[bool, bool, bool], Tuple[str, ...]] = {
+    (can_read, can_write, can_delete): (
+        (tuple(sorted(_READ_TOOLS)) if can_read else ())
+        + (tuple(sorted(_WRITE_TOOLS)) if can_write else ())
+        + (tuple(sorted(_DELETE_TOOLS)) if can_delete else ())
+    )
+    for can_read in (False, True)
+    for can_write in (False, True)
+    for can_delete in (False, True)
+}
+
+_RESTRICTED_ACTIONS_BY_PERMS: Dict[Tuple[bool, bool], Tuple[str, ...]] = {
+    (can_delete, can_manage): (
+        (() if can_delete else ("delete_files", "delete_resources"))
+        + (() if can_manage else ("modify_agent_config", "invite_users"))
+    )
+    for can_delete in (False, True)
+    for can_manage in (False, True)
+}
+
+
+@dataclass(slots=True)
 class AgentContextMapping:
     """Maps user context to agent execution context."""
     user_id: str
@@ -30,20 +99,47 @@ class AgentContextMapping:
     # User context
     user_email: str
     user_name: str
-    user_permissions: List[str]
+    user_permissions: Tuple[str, ...]
     user_role: str
 
     # Agent context
     agent_permissions: AgentPermissions
     context_variables: Dict[str, Any]
 
-    # Metadata
-    created_at: datetime
-    last_accessed: datetime
-    expires_at: datetime
-
-
-@dataclass
+    # Metadata as Unix epoch seconds - expiry checks are float compares
+    # against time.time() instead of per-call datetime allocations
+    created_at: float
+    last_accessed: float
+    expires_at: float
+
+    # ISO strings are formatted once and cached; only last_accessed
+    # changes over the mapping's lifetime and is re-formatted lazily
+    created_at_iso: str = field(init=False)
+    expires_at_iso: str = field(init=False)
+    _last_accessed_iso: str = field(init=False, repr=False)
+    _last_accessed_iso_ts: float = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.created_at_iso = datetime.fromtimestamp(
+            self.created_at, timezone.utc
+        ).isoformat()
+        self.expires_at_iso = datetime.fromtimestamp(
+            self.expires_at, timezone.utc
+        ).isoformat()
+        self._last_accessed_iso = self.created_at_iso
+        self._last_accessed_iso_ts = self.last_accessed
+
+    def last_accessed_iso(self) -> str:
+        """ISO form of last_accessed, re-formatted only when it moved."""
+        if self._last_accessed_iso_ts != self.last_accessed:
+            self._last_accessed_iso = datetime.fromtimestamp(
+                self.last_accessed, timezone.utc
+            ).isoformat()
+            self._last_accessed_iso_ts = self.last_accessed
+        return self._last_accessed_iso
+
+
+@dataclass(slots=True)
 class ConversationContext:
     """Represents the context for a conversation between user and agent."""
     session_id: str
@@ -53,7 +149,7 @@ class ConversationContext:
 
     # Conversation state
     message_count: int
-    last_message_at: datetime
+    last_message_at: float  # Unix epoch seconds
     conversation_variables: Dict[str, Any]
 
     # User preferences and history
@@ -62,8 +158,8 @@ class ConversationContext:
 
     # Agent configuration for this user
     personalized_system_prompt: Optional[str]
-    allowed_tools: List[str]
-    restricted_actions: List[str]
+    allowed_tools: Tuple[str, ...]
+    restricted_actions: Tuple[str, ...]
 
 
 class UserAgentMapper:
@@ -72,8 +168,29 @@ class UserAgentMapper:
     def __init__(self, settings: Optional[Settings] = None):
         self.settings = settings or get_settings()
         self.auth_utils = AuthenticationUtils(settings)
-        self._context_cache: Dict[str, AgentContextMapping] = {}
-        self._conversation_cache: Dict[str, ConversationContext] = {}
+        # Bounded LRU+TTL caches: plain dicts only shed entries when the
+        # exact key was re-requested after expiry, so idle (user, agent,
+        # workspace) triples accumulated for the life of the process. The
+        # TTL is a residency cap; per-mapping session expiry is still
+        # checked on every hit
+        cache_size = getattr(self.settings, "mapping_cache_size", 5000) or 5000
+        self._context_cache: TTLCache = TTLCache(maxsize=cache_size, ttl=3600)
+        self._conversation_cache: TTLCache = TTLCache(maxsize=cache_size, ttl=3600)
+        # Min-heap of (expires_at, cache_key) so expired mappings are
+        # swept opportunistically instead of lingering until their exact
+        # key happens to be looked up again
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # Preferences are read by both conversation creation and context
+        # builds; a short-TTL cache keeps that to one backend load per
+        # (user, workspace) per minute instead of one per call
+        self._prefs_cache: TTLCache = TTLCache(maxsize=cache_size, ttl=60)
+        # Workspace tool allowlists, memoized as frozensets (None means
+        # the workspace imposes no restriction)
+        self._workspace_tools_cache: TTLCache = TTLCache(maxsize=cache_size, ttl=300)
+        # In-flight mapping creations keyed by cache key: concurrent
+        # misses for the same triple await one computation instead of
+        # racing through validation and permission derivation in parallel
+        self._inflight: Dict[str, asyncio.Future] = {}
 
     async def create_agent_mapping(
         self,
@@ -84,15 +201,26 @@ class UserAgentMapper:
     ) -> AgentContextMapping:
         """Create a new user-to-agent mapping with context."""
 
+        # Interned so every cached mapping for the same user/agent/
+        # workspace shares one string object per id
+        agent_id = sys.intern(agent_id)
+        workspace_id = sys.intern(workspace_id)
+        user_id = sys.intern(session.user.id)
+
+        # One permissions lookup feeds both the access validation and the
+        # mapping itself; workspaces load lazily, so resolve them first
+        await session.ensure_workspaces()
+        workspace_perms = self._get_workspace_permissions(session, workspace_id)
+
         # Validate workspace access
-        if not await self._validate_agent_access(session, agent_id, workspace_id):
+        if not await self._validate_agent_access(
+            session, agent_id, workspace_id, workspace_perms
+        ):
             raise HTTPException(
                 status_code=403,
                 detail=f"Access denied to agent {agent_id} in workspace {workspace_id}"
             )
 
-        # Get user's workspace permissions
-        workspace_perms = self._get_workspace_permissions(session, workspace_id)
         if not workspace_perms:
             raise HTTPException(
                 status_code=403,
@@ -105,8 +233,9 @@ class UserAgentMapper:
         )
 
         # Create mapping
+        now = time.time()
         mapping = AgentContextMapping(
-            user_id=session.user.id,
+            user_id=user_id,
             agent_id=agent_id,
             workspace_id=workspace_id,
             session_id=session.id,
@@ -116,14 +245,15 @@ class UserAgentMapper:
             user_role=workspace_perms.role,
             agent_permissions=agent_permissions,
             context_variables=context_variables or {},
-            created_at=datetime.utcnow(),
-            last_accessed=datetime.utcnow(),
-            expires_at=session.expires_at
+            created_at=now,
+            last_accessed=now,
+            expires_at=session.expires_at_ts
         )
 
-        # Cache the mapping
-        cache_key = f"{session.user.id}:{agent_id}:{workspace_id}"
+        # Cache the mapping and index it for expiry sweeping
+        cache_key = f"{user_id}:{agent_id}:{workspace_id}"
         self._context_cache[cache_key] = mapping
+        heapq.heappush(self._expiry_heap, (mapping.expires_at, cache_key))
 
         logger.info(f"Created agent mapping for user {session.user.email} to agent {agent_id}")
         return mapping
@@ -136,22 +266,34 @@ class UserAgentMapper:
     ) -> Optional[AgentContextMapping]:
         """Get existing agent mapping for user."""
 
-        cache_key = f"{session.user.id}:{agent_id}:{workspace_id}"
+        self._sweep_expired()
 
         # Check cache first
-        if cache_key in self._context_cache:
-            mapping = self._context_cache[cache_key]
+        mapping = self._get_cached_mapping(session, agent_id, workspace_id)
+        if mapping is not None:
+            return mapping
 
-            # Validate mapping is still valid
-            if mapping.expires_at > datetime.utcnow():
-                mapping.last_accessed = datetime.utcnow()
-                return mapping
-            else:
-                # Remove expired mapping
-                del self._context_cache[cache_key]
-
-        # Create new mapping if none exists
-        return await self.create_agent_mapping(session, agent_id, workspace_id)
+        # Single-flight: a burst of misses for the same triple rides one
+        # in-flight creation rather than each redoing the work
+        cache_key = f"{session.user.id}:{agent_id}:{workspace_id}"
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            return await inflight
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            mapping = await self.create_agent_mapping(session, agent_id, workspace_id)
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so the loop does not warn when nobody joined
+            future.exception()
+            raise
+        else:
+            future.set_result(mapping)
+            return mapping
+        finally:
+            self._inflight.pop(cache_key, None)
 
     async def update_context_variables(
         self,
@@ -162,20 +304,20 @@ class UserAgentMapper:
     ) -> AgentContextMapping:
         """Update context variables for user-agent mapping."""
 
-        mapping = await self.get_agent_mapping(session, agent_id, workspace_id)
+        # Sync fast path on the cached mapping; only a miss pays the
+        # coroutine round through get_agent_mapping
+        mapping = self._get_cached_mapping(session, agent_id, workspace_id)
+        if mapping is None:
+            mapping = await self.get_agent_mapping(session, agent_id, workspace_id)
         if not mapping:
             raise HTTPException(
                 status_code=404,
                 detail="Agent mapping not found"
             )
 
-        # Merge variables
+        # Merge variables in place - the cache already holds this object
         mapping.context_variables.update(variables)
-        mapping.last_accessed = datetime.utcnow()
-
-        # Update cache
-        cache_key = f"{session.user.id}:{agent_id}:{workspace_id}"
-        self._context_cache[cache_key] = mapping
+        mapping.last_accessed = time.time()
 
         logger.debug(f"Updated context variables for user {session.user.email}")
         return mapping
@@ -189,6 +331,8 @@ class UserAgentMapper:
     ) -> ConversationContext:
         """Create conversation context for user-agent interaction."""
 
+        self._sweep_expired()
+
         # Get or create agent mapping
         mapping = await self.get_agent_mapping(session, agent_id, workspace_id)
 
@@ -202,13 +346,13 @@ class UserAgentMapper:
             agent_id=agent_id,
             workspace_id=workspace_id,
             message_count=1 if initial_message else 0,
-            last_message_at=datetime.utcnow(),
+            last_message_at=time.time(),
             conversation_variables={},
             user_preferences=user_preferences,
             conversation_history=[],
             personalized_system_prompt=None,
-            allowed_tools=await self._get_allowed_tools(mapping),
-            restricted_actions=await self._get_restricted_actions(mapping)
+            allowed_tools=self._get_allowed_tools(mapping),
+            restricted_actions=self._get_restricted_actions(mapping)
         )
 
         # Add initial message to history if provided
@@ -216,7 +360,7 @@ class UserAgentMapper:
             context.conversation_history.append({
                 "type": "user_message",
                 "content": initial_message,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
                 "metadata": {}
             })
 
@@ -234,7 +378,9 @@ class UserAgentMapper:
     ) -> Dict[str, Any]:
         """Get comprehensive user context for agent execution."""
 
-        mapping = await self.get_agent_mapping(session, agent_id, workspace_id)
+        mapping = self._get_cached_mapping(session, agent_id, workspace_id)
+        if mapping is None:
+            mapping = await self.get_agent_mapping(session, agent_id, workspace_id)
         if not mapping:
             raise HTTPException(
                 status_code=404,
@@ -255,13 +401,13 @@ class UserAgentMapper:
             },
             "agent": {
                 "id": mapping.agent_id,
-                "permissions": asdict(mapping.agent_permissions),
+                "permissions": mapping.agent_permissions.as_dict,
             },
             "session": {
                 "id": mapping.session_id,
-                "created_at": mapping.created_at.isoformat(),
-                "last_accessed": mapping.last_accessed.isoformat(),
-                "expires_at": mapping.expires_at.isoformat(),
+                "created_at": mapping.created_at_iso,
+                "last_accessed": mapping.last_accessed_iso(),
+                "expires_at": mapping.expires_at_iso,
             },
             "context_variables": mapping.context_variables,
             "user_preferences": await self._load_user_preferences(
@@ -284,11 +430,10 @@ class UserAgentMapper:
         if not mapping:
             return False
 
-        # Check agent permissions
-        if not mapping.agent_permissions.can_write and tool_name in self._write_tools:
-            return False
-
-        if not mapping.agent_permissions.can_delete and tool_name in self._delete_tools:
+        # Check agent permissions - one mask lookup and one integer AND
+        # instead of per-category branching
+        required = _TOOL_PERM_BITS.get(tool_name, 0)
+        if mapping.agent_permissions.perm_bits & required != required:
             return False
 
         # Check workspace-specific tool permissions
@@ -298,6 +443,36 @@ class UserAgentMapper:
 
         return True
 
+    async def validate_tool_access_bulk(
+        self,
+        session: SimSession,
+        agent_id: str,
+        workspace_id: str,
+        tool_names: List[str]
+    ) -> Dict[str, bool]:
+        """Validate access to many tools through an agent in one pass.
+
+        Agents typically check a batch of tools per turn; resolving the
+        mapping and workspace allowlist once means N tools cost two
+        awaits instead of 2N, with each answer a bitmap check.
+        """
+
+        mapping = await self.get_agent_mapping(session, agent_id, workspace_id)
+        if not mapping:
+            return {tool_name: False for tool_name in tool_names}
+
+        workspace_tools = await self._get_workspace_allowed_tools(workspace_id)
+        user_bits = mapping.agent_permissions.perm_bits
+
+        results = {}
+        for tool_name in tool_names:
+            required = _TOOL_PERM_BITS.get(tool_name, 0)
+            results[tool_name] = (
+                user_bits & required == required
+                and (not workspace_tools or tool_name in workspace_tools)
+            )
+        return results
+
     async def log_user_agent_interaction(
         self,
         session: SimSession,
@@ -315,7 +490,7 @@ class UserAgentMapper:
             "workspace_id": workspace_id,
             "session_id": session.id,
             "interaction_type": interaction_type,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "details": details
         }
 
@@ -325,16 +500,58 @@ class UserAgentMapper:
 
     # Private helper methods
 
-    async def _validate_agent_access(
+    def _get_cached_mapping(
         self,
         session: SimSession,
         agent_id: str,
         workspace_id: str
+    ) -> Optional[AgentContextMapping]:
+        """Synchronous cache fast path for an existing, unexpired mapping.
+
+        Lets hot callers skip the await (and its event-loop scheduling)
+        entirely when the mapping is already cached.
+        """
+        cache_key = f"{session.user.id}:{agent_id}:{workspace_id}"
+        mapping = self._context_cache.get(cache_key)
+        if mapping is not None:
+            now = time.time()
+            if mapping.expires_at > now:
+                mapping.last_accessed = now
+                return mapping
+            # Remove expired mapping
+            del self._context_cache[cache_key]
+        return None
+
+    def _sweep_expired(self):
+        """Drop expired mappings indexed by the expiry heap.
+
+        Amortized over lookups: each heap entry is pushed once and popped
+        once, so the sweep is O(expired) per call. A fresher mapping may
+        have replaced the one a heap entry was pushed for, so entries are
+        only evicted while actually expired.
+        """
+        now = time.time()
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, cache_key = heapq.heappop(heap)
+            mapping = self._context_cache.get(cache_key)
+            if mapping is not None and mapping.expires_at < now:
+                del self._context_cache[cache_key]
+
+    async def _validate_agent_access(
+        self,
+        session: SimSession,
+        agent_id: str,
+        workspace_id: str,
+        workspace_perms: Optional[WorkspacePermissions]
     ) -> bool:
-        """Validate user has access to agent in workspace."""
+        """Validate user has access to agent in workspace.
+
+        Takes the already-resolved workspace permissions so callers do
+        one lookup per request rather than one per check.
+        """
 
         # Check workspace access
-        workspace_perms = self._get_workspace_permissions(session, workspace_id)
         if not workspace_perms:
             return False
 
@@ -348,17 +565,8 @@ class UserAgentMapper:
         workspace_id: str
     ) -> Optional[WorkspacePermissions]:
         """Get user's permissions for specific workspace."""
-
-        for workspace in session.user.workspaces:
-            if workspace["id"] == workspace_id:
-                return WorkspacePermissions(
-                    workspace_id=workspace_id,
-                    permissions=workspace.get("permissions", []),
-                    role=workspace.get("role", "member"),
-                    is_owner=workspace.get("owner_id") == session.user.id
-                )
-
-        return None
+        # O(1) against the per-session index instead of a list scan
+        return self.auth_utils.workspace_permission_index(session).get(workspace_id)
 
     async def _load_user_preferences(
         self,
@@ -367,9 +575,14 @@ class UserAgentMapper:
     ) -> Dict[str, Any]:
         """Load user preferences for workspace."""
 
+        cache_key = (user_id, workspace_id)
+        prefs = self._prefs_cache.get(cache_key)
+        if prefs is not None:
+            return prefs
+
         # In production, this would load from database
         # For now, return default preferences
-        return {
+        prefs = {
             "language": "en",
             "timezone": "UTC",
             "notification_preferences": {
@@ -381,74 +594,44 @@ class UserAgentMapper:
                 "verbosity": "medium"
             }
         }
-
-    async def _get_allowed_tools(self, mapping: AgentContextMapping) -> List[str]:
-        """Get list of tools allowed for this user-agent mapping."""
-
-        allowed_tools = []
-
-        if mapping.agent_permissions.can_read:
-            allowed_tools.extend(self._read_tools)
-
-        if mapping.agent_permissions.can_write:
-            allowed_tools.extend(self._write_tools)
-
-        if mapping.agent_permissions.can_delete:
-            allowed_tools.extend(self._delete_tools)
-
-        return allowed_tools
-
-    async def _get_restricted_actions(self, mapping: AgentContextMapping) -> List[str]:
-        """Get list of restricted actions for this user-agent mapping."""
-
-        restricted = []
-
-        if not mapping.agent_permissions.can_delete:
-            restricted.append("delete_files")
-            restricted.append("delete_resources")
-
-        if not mapping.agent_permissions.can_manage:
-            restricted.append("modify_agent_config")
-            restricted.append("invite_users")
-
-        return restricted
-
-    async def _get_workspace_allowed_tools(self, workspace_id: str) -> Optional[List[str]]:
+        self._prefs_cache[cache_key] = prefs
+        return prefs
+
+    @staticmethod
+    def _get_allowed_tools(mapping: AgentContextMapping) -> Tuple[str, ...]:
+        """Get tools allowed for this user-agent mapping."""
+        perms = mapping.agent_permissions
+        return _ALLOWED_TOOLS_BY_PERMS[
+            (perms.can_read, perms.can_write, perms.can_delete)
+        ]
+
+    @staticmethod
+    def _get_restricted_actions(mapping: AgentContextMapping) -> Tuple[str, ...]:
+        """Get restricted actions for this user-agent mapping."""
+        perms = mapping.agent_permissions
+        return _RESTRICTED_ACTIONS_BY_PERMS[(perms.can_delete, perms.can_manage)]
+
+    async def _get_workspace_allowed_tools(
+        self, workspace_id: str
+    ) -> Optional[frozenset]:
         """Get workspace-specific allowed tools."""
 
-        # In production, this would query workspace configuration
-        # For now, return None (no restrictions)
-        return None
-
-    # Tool categories for permission checking
-    _read_tools = [
-        "search_knowledge_base",
-        "get_user_info",
-        "list_files",
-        "read_document"
-    ]
-
-    _write_tools = [
-        "create_document",
-        "update_document",
-        "send_email",
-        "create_task"
-    ]
+        cached = self._workspace_tools_cache.get(workspace_id, _MISSING)
+        if cached is not _MISSING:
+            return cached
 
-    _delete_tools = [
-        "delete_document",
-        "delete_task",
-        "remove_user"
-    ]
-
-
-# Global instance
-_user_agent_mapper: Optional[UserAgentMapper] = None
+        # In production, this would query workspace configuration and
+        # return a frozenset of tool names
+        # For now, return None (no restrictions)
+        tools = None
+        self._workspace_tools_cache[workspace_id] = tools
+        return tools
 
 
+@functools.lru_cache(maxsize=1)
 def get_user_agent_mapper() -> UserAgentMapper:
-    """Get or create global user-agent mapper instance."""
-    global _user_agent_mapper
-    if _user_agent_mapper is None:
-        _user_agent_mapper = UserAgentMapper()
-    return _user_agent_mapper
\ No newline at end of file
+    """Get the shared user-agent mapper instance.
+
+    Tests can reset with cache_clear().
+    """
+    return UserAgentMapper()
\ No newline at end of file
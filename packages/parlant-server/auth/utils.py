@@ -3,32 +3,60 @@ Authentication utilities for Parlant server
 Provides helper functions for session management and security
 """
 
+import functools
 import logging
+import re
 import secrets
+import sys
 import hashlib
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
-from dataclasses import dataclass
+import hmac
+import time
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime
+from dataclasses import dataclass, field
 
+from cachetools import TTLCache
 from fastapi import Request, HTTPException
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 
 from auth.sim_auth_bridge import SimSession, SimUser
 from config.settings import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
+# Permission bits for mask-based access checks
+PERM_READ = 1
+PERM_WRITE = 2
+PERM_DELETE = 4
 
-@dataclass
+# Common bot/scanner markers folded into one alternation: a single C-level
+# scan instead of one substring pass per pattern, and IGNORECASE avoids
+# the per-request .lower() copy
+_SUSPICIOUS_UA = re.compile(r"bot|crawler|scanner|sqlmap|nmap", re.IGNORECASE)
+
+
+@dataclass(slots=True)
 class WorkspacePermissions:
     """Represents user permissions within a workspace."""
     workspace_id: str
-    permissions: List[str]
+    permissions: Tuple[str, ...]
     role: str
     is_owner: bool = False
+    # Serialized form, built once: instances are immutable after
+    # construction, so context builds share one dict instead of paying
+    # dataclasses.asdict's recursive copy per call
+    as_dict: Dict[str, Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.as_dict = {
+            "workspace_id": self.workspace_id,
+            "permissions": self.permissions,
+            "role": self.role,
+            "is_owner": self.is_owner,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentPermissions:
     """Represents user permissions for specific agents."""
     agent_id: str
@@ -37,6 +65,25 @@ class AgentPermissions:
     can_write: bool = False
     can_delete: bool = False
     can_manage: bool = False
+    as_dict: Dict[str, Any] = field(init=False, repr=False, compare=False)
+    # Capability mask (PERM_READ|PERM_WRITE|PERM_DELETE) so tool checks
+    # are one integer AND instead of several attribute/branch hops
+    perm_bits: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.perm_bits = (
+            (PERM_READ if self.can_read else 0)
+            | (PERM_WRITE if self.can_write else 0)
+            | (PERM_DELETE if self.can_delete else 0)
+        )
+        self.as_dict = {
+            "agent_id": self.agent_id,
+            "workspace_id": self.workspace_id,
+            "can_read": self.can_read,
+            "can_write": self.can_write,
+            "can_delete": self.can_delete,
+            "can_manage": self.can_manage,
+        }
 
 
 class AuthenticationUtils:
@@ -44,6 +91,14 @@ class AuthenticationUtils:
 
     def __init__(self, settings: Optional[Settings] = None):
         self.settings = settings or get_settings()
+        # AgentPermissions memo keyed by (session, agent, workspace):
+        # the derivation re-walks workspace data on every agent call
+        # otherwise. Short TTL bounds staleness after permission changes
+        self._agent_perms_cache: TTLCache = TTLCache(maxsize=5000, ttl=300)
+        # Pre-constructed JWK so jose skips re-preparing the HMAC key
+        # object on every token encode/verify
+        self._jwt_alg = self.settings.jwt_algorithm
+        self._jwt_key = jwk.construct(self.settings.jwt_secret_key, self._jwt_alg)
 
     def generate_session_id(self) -> str:
         """Generate a unique session identifier."""
@@ -53,13 +108,27 @@ class AuthenticationUtils:
         """Generate a secure API key."""
         return secrets.token_urlsafe(64)
 
+    @staticmethod
+    def _hash_api_key_bytes(api_key: str) -> bytes:
+        """Raw SHA-256 digest of an API key."""
+        return hashlib.sha256(api_key.encode()).digest()
+
     def hash_api_key(self, api_key: str) -> str:
         """Hash an API key for secure storage."""
-        return hashlib.sha256(api_key.encode()).hexdigest()
+        return self._hash_api_key_bytes(api_key).hex()
 
     def verify_api_key(self, api_key: str, hashed_key: str) -> bool:
-        """Verify an API key against its hash."""
-        return hashlib.sha256(api_key.encode()).hexdigest() == hashed_key
+        """Verify an API key against its hash.
+
+        Compares raw digests with hmac.compare_digest: constant-time
+        (the previous == on hex strings exited early, leaking timing)
+        and skips one hexdigest conversion per verify.
+        """
+        try:
+            expected = bytes.fromhex(hashed_key)
+        except ValueError:
+            return False
+        return hmac.compare_digest(self._hash_api_key_bytes(api_key), expected)
 
     def create_workspace_token(
         self,
@@ -69,30 +138,24 @@ class AuthenticationUtils:
         expires_hours: int = 24
     ) -> str:
         """Create a workspace-scoped token for API access."""
-        now = datetime.utcnow()
+        # Epoch claims go straight into the payload - no datetime objects
+        # for jose to convert per encode
+        now = time.time()
         payload = {
             "user_id": user_id,
             "workspace_id": workspace_id,
             "permissions": permissions,
             "iat": now,
-            "exp": now + timedelta(hours=expires_hours),
+            "exp": now + expires_hours * 3600,
             "type": "workspace_token"
         }
 
-        return jwt.encode(
-            payload,
-            self.settings.jwt_secret_key,
-            algorithm=self.settings.jwt_algorithm
-        )
+        return jwt.encode(payload, self._jwt_key, algorithm=self._jwt_alg)
 
     def verify_workspace_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify and decode a workspace token."""
         try:
-            payload = jwt.decode(
-                token,
-                self.settings.jwt_secret_key,
-                algorithms=[self.settings.jwt_algorithm]
-            )
+            payload = jwt.decode(token, self._jwt_key, algorithms=[self._jwt_alg])
 
             if payload.get("type") != "workspace_token":
                 return None
@@ -103,20 +166,44 @@ class AuthenticationUtils:
             logger.warning(f"Invalid workspace token: {e}")
             return None
 
-    def extract_permissions_from_session(self, session: SimSession) -> List[WorkspacePermissions]:
-        """Extract workspace permissions from a session."""
-        permissions = []
-
-        for workspace in session.user.workspaces:
-            workspace_perms = WorkspacePermissions(
-                workspace_id=workspace["id"],
-                permissions=workspace.get("permissions", []),
-                role=workspace.get("role", "member"),
-                is_owner=workspace.get("owner_id") == session.user.id
+    def workspace_permission_index(
+        self, session: SimSession
+    ) -> Dict[str, WorkspacePermissions]:
+        """Get the workspace_id -> WorkspacePermissions index for a session.
+
+        Built once per workspace list and cached on the session, so every
+        downstream permission check is an O(1) lookup instead of a linear
+        scan over session.user.workspaces. The cache keys on the list
+        object itself, so a set_workspaces refresh rebuilds the index.
+        """
+        workspaces = session.user.workspaces
+        index = getattr(session, "_workspace_perm_index", None)
+        if (index is not None
+                and getattr(session, "_workspace_perm_index_src", None) is workspaces):
+            return index
+
+        # Interned ids and permission tokens: thousands of cached entries
+        # share one string object per distinct value, and membership tests
+        # hit the pointer-compare fast path
+        user_id = session.user.id
+        index = {}
+        for workspace in workspaces:
+            ws_id = sys.intern(workspace["id"])
+            index[ws_id] = WorkspacePermissions(
+                workspace_id=ws_id,
+                permissions=tuple(
+                    sys.intern(p) for p in workspace.get("permissions", [])
+                ),
+                role=sys.intern(workspace.get("role", "member")),
+                is_owner=workspace.get("owner_id") == user_id
             )
-            permissions.append(workspace_perms)
+        session._workspace_perm_index = index
+        session._workspace_perm_index_src = workspaces
+        return index
 
-        return permissions
+    def extract_permissions_from_session(self, session: SimSession) -> List[WorkspacePermissions]:
+        """Extract workspace permissions from a session."""
+        return list(self.workspace_permission_index(session).values())
 
     def check_workspace_permission(
         self,
@@ -125,17 +212,38 @@ class AuthenticationUtils:
         required_permission: str
     ) -> bool:
         """Check if user has specific permission in workspace."""
-        workspace_permissions = self.extract_permissions_from_session(session)
+        workspace_perm = self.workspace_permission_index(session).get(workspace_id)
+        if workspace_perm is None:
+            return False
+
+        return (
+            required_permission in workspace_perm.permissions or
+            workspace_perm.is_owner or
+            workspace_perm.role == "admin"
+        )
 
-        for workspace_perm in workspace_permissions:
-            if workspace_perm.workspace_id == workspace_id:
-                return (
+    def check_workspace_permissions_bulk(
+        self,
+        session: SimSession,
+        checks: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], bool]:
+        """Check many (workspace_id, permission) pairs in one pass.
+
+        The index is resolved once, so N checks cost N dict lookups
+        rather than N scans over the workspace list.
+        """
+        index = self.workspace_permission_index(session)
+        results = {}
+        for workspace_id, required_permission in checks:
+            workspace_perm = index.get(workspace_id)
+            results[(workspace_id, required_permission)] = (
+                workspace_perm is not None and (
                     required_permission in workspace_perm.permissions or
                     workspace_perm.is_owner or
                     workspace_perm.role == "admin"
                 )
-
-        return False
+            )
+        return results
 
     def get_accessible_workspaces(self, session: SimSession) -> List[str]:
         """Get list of workspace IDs that user has access to."""
@@ -148,31 +256,35 @@ class AuthenticationUtils:
         workspace_id: str
     ) -> AgentPermissions:
         """Create agent permissions based on workspace access."""
-        workspace_perms = None
+        cache_key = (session.id, agent_id, workspace_id)
+        cached = self._agent_perms_cache.get(cache_key)
+        if cached is not None and time.time() < session.expires_at_ts:
+            return cached
 
-        for workspace in session.user.workspaces:
-            if workspace["id"] == workspace_id:
-                workspace_perms = workspace
-                break
+        workspace_perms = self.workspace_permission_index(session).get(workspace_id)
 
         if not workspace_perms:
-            return AgentPermissions(
+            agent_perms = AgentPermissions(
                 agent_id=agent_id,
                 workspace_id=workspace_id
             )
+        else:
+            permissions = workspace_perms.permissions
+            role = workspace_perms.role
+            is_owner = workspace_perms.is_owner
+            agent_perms = AgentPermissions(
+                agent_id=agent_id,
+                workspace_id=workspace_id,
+                can_read="read" in permissions or is_owner or role == "admin",
+                can_write="write" in permissions or is_owner or role == "admin",
+                can_delete="admin" in permissions or is_owner,
+                can_manage=is_owner or role == "admin"
+            )
 
-        permissions = workspace_perms.get("permissions", [])
-        role = workspace_perms.get("role", "member")
-        is_owner = workspace_perms.get("owner_id") == session.user.id
-
-        return AgentPermissions(
-            agent_id=agent_id,
-            workspace_id=workspace_id,
-            can_read="read" in permissions or is_owner or role == "admin",
-            can_write="write" in permissions or is_owner or role == "admin",
-            can_delete="admin" in permissions or is_owner,
-            can_manage=is_owner or role == "admin"
-        )
+        # The dataclass is never mutated after construction, so sharing
+        # one instance across callers is safe
+        self._agent_perms_cache[cache_key] = agent_perms
+        return agent_perms
 
 
 class SessionManager:
@@ -189,14 +301,9 @@ class SessionManager:
         agent_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create Parlant-specific session context."""
-        workspace_permissions = self.auth_utils.extract_permissions_from_session(session)
-
-        # Find workspace permissions
-        workspace_perm = None
-        for perm in workspace_permissions:
-            if perm.workspace_id == workspace_id:
-                workspace_perm = perm
-                break
+        workspace_perm = self.auth_utils.workspace_permission_index(session).get(
+            workspace_id
+        )
 
         if not workspace_perm:
             raise HTTPException(
@@ -220,7 +327,7 @@ class SessionManager:
             },
             "session_metadata": {
                 "created_at": datetime.utcnow().isoformat(),
-                "expires_at": session.expires_at.isoformat(),
+                "expires_at": session.expires_at_iso,
                 "ip_address": session.ip_address,
                 "user_agent": session.user_agent
             }
@@ -231,18 +338,20 @@ class SessionManager:
                 "id": agent_id,
                 "permissions": self.auth_utils.create_agent_permissions(
                     session, agent_id, workspace_id
-                ).__dict__
+                ).as_dict
             }
 
         return context
 
     def validate_session_expiry(self, session: SimSession) -> bool:
         """Check if session is still valid."""
-        return datetime.utcnow() < session.expires_at
+        # Float compare against the precomputed epoch - no datetime
+        # allocation per check
+        return time.time() < session.expires_at_ts
 
-    def get_session_time_remaining(self, session: SimSession) -> timedelta:
-        """Get remaining time for session."""
-        return max(timedelta(0), session.expires_at - datetime.utcnow())
+    def get_session_time_remaining(self, session: SimSession) -> float:
+        """Get remaining session lifetime in seconds."""
+        return max(0.0, session.expires_at_ts - time.time())
 
 
 def get_current_workspace_id(request: Request) -> Optional[str]:
@@ -268,13 +377,20 @@ def require_workspace_permission(permission: str):
     return decorator
 
 
+@functools.lru_cache(maxsize=1)
 def get_auth_utils() -> AuthenticationUtils:
-    """Get authentication utilities instance."""
+    """Get the shared authentication utilities instance.
+
+    Previously constructed a fresh AuthenticationUtils per call, which
+    threw away the permission memo and prepared JWT key on every FastAPI
+    dependency resolution. Tests can reset with cache_clear().
+    """
     return AuthenticationUtils()
 
 
+@functools.lru_cache(maxsize=1)
 def get_session_manager() -> SessionManager:
-    """Get session manager instance."""
+    """Get the shared session manager instance."""
     return SessionManager()
 
 
@@ -300,15 +416,7 @@ class SecurityValidator:
         if not user_agent or len(user_agent) < 10:
             return False
 
-        # Check for common bot/scanner patterns
-        suspicious_patterns = ['bot', 'crawler', 'scanner', 'sqlmap', 'nmap']
-        user_agent_lower = user_agent.lower()
-
-        for pattern in suspicious_patterns:
-            if pattern in user_agent_lower:
-                return False
-
-        return True
+        return _SUSPICIOUS_UA.search(user_agent) is None
 
     @staticmethod
     def validate_rate_limit(user_id: str, endpoint: str, max_requests: int = 100) -> bool:
@@ -14,12 +14,14 @@ Key Features:
 - Cross-workspace access prevention
 """
 
+import asyncio
 import logging
 from typing import Dict, List, Optional, Set, Any
-from datetime import datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass, field
 
+from cachetools import TTLCache
+
 from sqlalchemy import select, and_, or_, func, text
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
@@ -30,6 +32,42 @@ from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Sim schema tables, resolved lazily on first use and memoized. The
+# import has to stay out of module scope (the tables are provided by
+# the host environment, not this package), but re-running the import
+# machinery inside every cache-miss query is wasted work once it has
+# succeeded
+_schema_tables = None
+
+
+def _get_schema_tables():
+    """Resolve and memoize the (workspace, permissions, parlantAgent) tables."""
+    global _schema_tables
+    if _schema_tables is None:
+        from packages.db.schema import workspace, permissions
+        from packages.db.parlant_schema import parlantAgent
+        _schema_tables = (workspace, permissions, parlantAgent)
+    return _schema_tables
+
+
+def _session_workspace_index(session: SimSession) -> Dict[str, Dict[str, Any]]:
+    """Index the session user's workspaces by id.
+
+    Memoized on the session object, keyed by the identity of the
+    workspace list, so the dict is rebuilt only when the auth bridge
+    swaps in a fresh list - repeated permission-context builds across
+    workspaces stop re-scanning the list linearly.
+    """
+    workspaces = session.user.workspaces or []
+    index = getattr(session, "_ws_index", None)
+    if index is not None and getattr(session, "_ws_index_src", None) is workspaces:
+        return index
+
+    index = {ws.get('id'): ws for ws in workspaces}
+    session._ws_index = index
+    session._ws_index_src = workspaces
+    return index
+
 
 class PermissionLevel(Enum):
     """Permission levels matching Sim's permission system."""
@@ -47,7 +85,35 @@ class AgentAccessLevel(Enum):
     MANAGE = "manage"      # Full agent management
 
 
-@dataclass
+# Permission ordering used by has_minimum_permission. The enum keeps
+# Sim's string values for database/API compatibility, so ranks live in
+# a module table instead of being rebuilt per check
+_PERM_RANK = {
+    PermissionLevel.READ: 1,
+    PermissionLevel.WRITE: 2,
+    PermissionLevel.ADMIN: 3,
+}
+
+# Agent access levels that satisfy each agent-scoped operation;
+# frozensets give O(1) membership without per-call list construction.
+# agent_creation and agent_deletion have bespoke rules and are handled
+# explicitly in _check_operation_access
+_OP_ALLOWED_LEVELS = {
+    'agent_interaction': frozenset({
+        AgentAccessLevel.VIEW,
+        AgentAccessLevel.INTERACT,
+        AgentAccessLevel.CONFIGURE,
+        AgentAccessLevel.MANAGE,
+    }),
+    'agent_configuration': frozenset({
+        AgentAccessLevel.CONFIGURE,
+        AgentAccessLevel.MANAGE,
+    }),
+    'agent_management': frozenset({AgentAccessLevel.MANAGE}),
+}
+
+
+@dataclass(slots=True)
 class WorkspacePermissionContext:
     """Comprehensive workspace permission context."""
     workspace_id: str
@@ -56,17 +122,16 @@ class WorkspacePermissionContext:
     workspace_name: str
     organization_id: Optional[str]
     is_owner: bool = False
-    cached_at: datetime = field(default_factory=datetime.now)
     access_patterns: Set[str] = field(default_factory=set)
+    # Numeric rank of permission_level, resolved once at construction
+    permission_rank: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.permission_rank = _PERM_RANK[self.permission_level]
 
     def has_minimum_permission(self, required_level: PermissionLevel) -> bool:
         """Check if user has at least the required permission level."""
-        permission_hierarchy = {
-            PermissionLevel.READ: 1,
-            PermissionLevel.WRITE: 2,
-            PermissionLevel.ADMIN: 3
-        }
-        return permission_hierarchy[self.permission_level] >= permission_hierarchy[required_level]
+        return self.permission_rank >= _PERM_RANK[required_level]
 
     def can_create_agents(self) -> bool:
         """Check if user can create agents in workspace."""
@@ -81,7 +146,7 @@ class WorkspacePermissionContext:
         return self.has_minimum_permission(PermissionLevel.WRITE) or self.is_owner
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentAccessContext:
     """Agent-specific access context."""
     agent_id: str
@@ -90,7 +155,6 @@ class AgentAccessContext:
     access_level: AgentAccessLevel
     permission_context: WorkspacePermissionContext
     restrictions: List[str] = field(default_factory=list)
-    last_accessed: Optional[datetime] = None
 
 
 class WorkspaceAccessController:
@@ -106,18 +170,28 @@ class WorkspaceAccessController:
 
     def __init__(self):
         self.settings = get_settings()
-        self._permission_cache: Dict[str, WorkspacePermissionContext] = {}
-        self._agent_access_cache: Dict[str, AgentAccessContext] = {}
-        self._cache_ttl = timedelta(minutes=10)
-
-        # Access control policies
-        self._access_policies = {
-            'agent_creation': self._validate_agent_creation_access,
-            'agent_interaction': self._validate_agent_interaction_access,
-            'agent_configuration': self._validate_agent_configuration_access,
-            'agent_management': self._validate_agent_management_access,
-            'agent_deletion': self._validate_agent_deletion_access,
-        }
+        # Bounded caches with eviction handled by cachetools: expired or
+        # least-recently-set entries simply vanish, so lookups below need
+        # no manual timestamp checks
+        cache_size = self.settings.permission_cache_size
+        self._permission_cache: TTLCache = TTLCache(maxsize=cache_size, ttl=600)
+        self._agent_access_cache: TTLCache = TTLCache(maxsize=cache_size, ttl=600)
+        # In-flight cache-miss builds keyed by cache key: concurrent
+        # misses for the same key await one database build instead of
+        # issuing duplicate queries
+        self._perm_inflight: Dict[tuple, asyncio.Future] = {}
+        self._agent_inflight: Dict[tuple, asyncio.Future] = {}
+        # Negative cache for agent lookups that 404ed: repeated probes
+        # for a missing or deleted agent (retrying clients, stale UI
+        # references) skip the database for a short window. 30 seconds
+        # keeps a newly created agent from being masked for long
+        self._deny_cache: TTLCache = TTLCache(maxsize=2048, ttl=30)
+        # Audit records are drained by a background task so the request
+        # path never blocks on log-handler I/O. Created lazily because
+        # the module singleton is constructed at import time, before any
+        # event loop is running
+        self._audit_queue: Optional[asyncio.Queue] = None
+        self._audit_task: Optional[asyncio.Task] = None
 
     async def get_workspace_permission_context(
         self,
@@ -133,21 +207,50 @@ class WorkspaceAccessController:
         - Organization context
         - Access patterns and restrictions
         """
-        cache_key = f"{session.user.id}:{workspace_id}"
-
-        # Check cache first
-        if cache_key in self._permission_cache:
-            cached_context = self._permission_cache[cache_key]
-            if datetime.now() - cached_context.cached_at < self._cache_ttl:
-                return cached_context
+        # Tuple keys avoid per-call string interpolation and let the
+        # event-driven invalidation match components without parsing
+        cache_key = (session.user.id, workspace_id)
+
+        # Check cache first (TTLCache drops expired entries on lookup)
+        cached_context = self._permission_cache.get(cache_key)
+        if cached_context is not None:
+            return cached_context
+
+        # Single-flight: a burst of misses for the same key rides one
+        # in-flight build rather than each hitting the database
+        inflight = self._perm_inflight.get(cache_key)
+        if inflight is not None:
+            return await inflight
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._perm_inflight[cache_key] = future
+        try:
+            context = await self._build_workspace_permission_context(
+                session, workspace_id, cache_key
+            )
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so the loop does not warn when nobody joined
+            future.exception()
+            raise
+        else:
+            future.set_result(context)
+            return context
+        finally:
+            self._perm_inflight.pop(cache_key, None)
 
+    async def _build_workspace_permission_context(
+        self,
+        session: SimSession,
+        workspace_id: str,
+        cache_key: tuple
+    ) -> WorkspacePermissionContext:
+        """Build and cache a permission context on a cache miss."""
         try:
-            # Get workspace from user's workspace list (already validated by auth middleware)
-            workspace_found = None
-            for workspace in session.user.workspaces or []:
-                if workspace.get('id') == workspace_id:
-                    workspace_found = workspace
-                    break
+            # Workspaces load lazily - make sure they are present before
+            # indexing, or every membership check would silently deny
+            await session.ensure_workspaces()
+            workspace_found = _session_workspace_index(session).get(workspace_id)
 
             if not workspace_found:
                 raise HTTPException(
@@ -157,50 +260,36 @@ class WorkspaceAccessController:
 
             # Create permission context using Sim's permission patterns
             async with get_async_session_context() as db_session:
-                # Check if user is workspace owner
-                from packages.db.schema import workspace as workspace_table
-                workspace_query = select(workspace_table).where(workspace_table.id == workspace_id)
-                workspace_result = await db_session.execute(workspace_query)
-                workspace_data = workspace_result.scalar_one_or_none()
-
-                is_owner = workspace_data and workspace_data.ownerId == session.user.id
-
-                # Get user's permission level from Sim's permission system
-                from packages.db.schema import permissions
-                permission_query = select(permissions.permissionType).where(
-                    and_(
-                        permissions.userId == session.user.id,
-                        permissions.entityType == 'workspace',
-                        permissions.entityId == workspace_id
+                # Fetch ownership and the user's permission grant in one
+                # round-trip: LEFT JOIN the permission row (if any) onto
+                # the workspace row instead of issuing two queries
+                workspace_table, permissions, _ = _get_schema_tables()
+                owner_perm_query = (
+                    select(workspace_table.ownerId, permissions.permissionType)
+                    .outerjoin(
+                        permissions,
+                        and_(
+                            permissions.userId == session.user.id,
+                            permissions.entityType == 'workspace',
+                            permissions.entityId == workspace_table.id
+                        )
                     )
+                    .where(workspace_table.id == workspace_id)
                 )
-                permission_result = await db_session.execute(permission_query)
-                user_permission = permission_result.scalar_one_or_none()
-
-                # Determine effective permission level
-                if is_owner:
-                    effective_permission = PermissionLevel.ADMIN
-                elif user_permission:
-                    effective_permission = PermissionLevel(user_permission)
-                else:
-                    effective_permission = PermissionLevel.READ  # Default fallback
+                owner_perm_result = await db_session.execute(owner_perm_query)
+                owner_perm_row = owner_perm_result.first()
 
-                # Create comprehensive permission context
-                permission_context = WorkspacePermissionContext(
-                    workspace_id=workspace_id,
-                    user_id=session.user.id,
-                    permission_level=effective_permission,
-                    workspace_name=workspace_found.get('name', 'Unknown'),
-                    organization_id=session.active_organization_id,
-                    is_owner=is_owner
+                permission_context = self._make_permission_context(
+                    session, workspace_id, workspace_found, owner_perm_row
                 )
 
                 # Cache the context
                 self._permission_cache[cache_key] = permission_context
 
                 logger.debug(
-                    f"Created permission context for user {session.user.id} "
-                    f"in workspace {workspace_id}: {effective_permission.value}"
+                    "Created permission context for user %s in workspace %s: %s",
+                    session.user.id, workspace_id,
+                    permission_context.permission_level.value
                 )
 
                 return permission_context
@@ -214,6 +303,34 @@ class WorkspaceAccessController:
                 detail="Failed to validate workspace permissions"
             )
 
+    def _make_permission_context(
+        self,
+        session: SimSession,
+        workspace_id: str,
+        workspace_found: Dict[str, Any],
+        owner_perm_row: Optional[Any]
+    ) -> WorkspacePermissionContext:
+        """Build a permission context from an (ownerId, permissionType) row."""
+        is_owner = owner_perm_row is not None and owner_perm_row[0] == session.user.id
+        user_permission = owner_perm_row[1] if owner_perm_row else None
+
+        # Determine effective permission level
+        if is_owner:
+            effective_permission = PermissionLevel.ADMIN
+        elif user_permission:
+            effective_permission = PermissionLevel(user_permission)
+        else:
+            effective_permission = PermissionLevel.READ  # Default fallback
+
+        return WorkspacePermissionContext(
+            workspace_id=workspace_id,
+            user_id=session.user.id,
+            permission_level=effective_permission,
+            workspace_name=workspace_found.get('name', 'Unknown'),
+            organization_id=session.active_organization_id,
+            is_owner=is_owner
+        )
+
     async def get_agent_access_context(
         self,
         session: SimSession,
@@ -229,46 +346,134 @@ class WorkspaceAccessController:
         - Organization policies
         - Access restrictions
         """
-        cache_key = f"{session.user.id}:{agent_id}:{workspace_id}"
+        cache_key = (session.user.id, agent_id, workspace_id)
 
-        # Check cache first
-        if cache_key in self._agent_access_cache:
-            cached_context = self._agent_access_cache[cache_key]
-            if cached_context.last_accessed and \
-               datetime.now() - cached_context.last_accessed < self._cache_ttl:
-                return cached_context
+        # Check cache first (TTLCache drops expired entries on lookup)
+        cached_context = self._agent_access_cache.get(cache_key)
+        if cached_context is not None:
+            return cached_context
 
+        # Recently 404ed lookups fail fast without re-querying
+        if cache_key in self._deny_cache:
+            raise HTTPException(
+                status_code=404,
+                detail="Agent not found or access denied"
+            )
+
+        # Single-flight: coalesce concurrent misses for the same key
+        inflight = self._agent_inflight.get(cache_key)
+        if inflight is not None:
+            return await inflight
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._agent_inflight[cache_key] = future
         try:
-            # Get workspace permission context first
-            permission_context = await self.get_workspace_permission_context(session, workspace_id)
+            context = await self._build_agent_access_context(
+                session, agent_id, workspace_id, cache_key
+            )
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so the loop does not warn when nobody joined
+            future.exception()
+            raise
+        else:
+            future.set_result(context)
+            return context
+        finally:
+            self._agent_inflight.pop(cache_key, None)
+
+    async def _build_agent_access_context(
+        self,
+        session: SimSession,
+        agent_id: str,
+        workspace_id: str,
+        cache_key: tuple
+    ) -> AgentAccessContext:
+        """Build and cache an agent access context on a cache miss."""
+        try:
+            perm_key = (session.user.id, workspace_id)
+            permission_context = self._permission_cache.get(perm_key)
 
-            # Get agent information
             async with get_async_session_context() as db_session:
-                from packages.db.parlant_schema import parlantAgent
+                workspace_table, permissions, parlantAgent = _get_schema_tables()
+
+                if permission_context is not None:
+                    # Warm permission context: only the agent row is
+                    # needed. Project only the columns the access ladder
+                    # reads instead of materializing the full ORM row
+                    agent_query = select(parlantAgent.createdBy, parlantAgent.status).where(
+                        and_(
+                            parlantAgent.id == agent_id,
+                            parlantAgent.workspaceId == workspace_id,
+                            parlantAgent.deletedAt.is_(None)
+                        )
+                    )
+                    agent_result = await db_session.execute(agent_query)
+                    agent = agent_result.first()
+                else:
+                    # Fully cold path: resolve workspace ownership, the
+                    # user's permission grant and the agent row with one
+                    # three-way join instead of two sequential queries
+                    await session.ensure_workspaces()
+                    workspace_found = _session_workspace_index(session).get(workspace_id)
+                    if not workspace_found:
+                        raise HTTPException(
+                            status_code=403,
+                            detail=f"Access denied to workspace {workspace_id}"
+                        )
 
-                agent_query = select(parlantAgent).where(
-                    and_(
-                        parlantAgent.id == agent_id,
-                        parlantAgent.workspaceId == workspace_id,
-                        parlantAgent.deletedAt.is_(None)
+                    fused_query = (
+                        select(
+                            workspace_table.ownerId,
+                            permissions.permissionType,
+                            parlantAgent.createdBy,
+                            parlantAgent.status
+                        )
+                        .outerjoin(
+                            permissions,
+                            and_(
+                                permissions.userId == session.user.id,
+                                permissions.entityType == 'workspace',
+                                permissions.entityId == workspace_table.id
+                            )
+                        )
+                        .outerjoin(
+                            parlantAgent,
+                            and_(
+                                parlantAgent.id == agent_id,
+                                parlantAgent.workspaceId == workspace_table.id,
+                                parlantAgent.deletedAt.is_(None)
+                            )
+                        )
+                        .where(workspace_table.id == workspace_id)
                     )
-                )
-                agent_result = await db_session.execute(agent_query)
-                agent = agent_result.scalar_one_or_none()
+                    fused_result = await db_session.execute(fused_query)
+                    fused_row = fused_result.first()
+
+                    permission_context = self._make_permission_context(
+                        session, workspace_id, workspace_found, fused_row
+                    )
+                    self._permission_cache[perm_key] = permission_context
 
-                if not agent:
+                    # LEFT JOIN yields NULL agent columns when no row matched
+                    agent = fused_row if (
+                        fused_row is not None and fused_row[2] is not None
+                    ) else None
+
+                if agent is None:
+                    self._deny_cache[cache_key] = True
                     raise HTTPException(
                         status_code=404,
                         detail="Agent not found or access denied"
                     )
 
                 # Determine agent access level based on permissions
-                access_level = await self._determine_agent_access_level(
+                access_level = self._determine_agent_access_level(
                     permission_context, agent, session.user.id
                 )
 
                 # Check for any access restrictions
-                restrictions = await self._get_agent_access_restrictions(
+                restrictions = self._get_agent_access_restrictions(
                     permission_context, agent
                 )
 
@@ -279,8 +484,7 @@ class WorkspaceAccessController:
                     created_by=agent.createdBy,
                     access_level=access_level,
                     permission_context=permission_context,
-                    restrictions=restrictions,
-                    last_accessed=datetime.now()
+                    restrictions=restrictions
                 )
 
                 # Cache the context
@@ -321,7 +525,7 @@ class WorkspaceAccessController:
         - agent_deletion: Deleting agents
         """
         try:
-            logger.debug(f"Validating {operation} access for user {session.user.id}")
+            logger.debug("Validating %s access for user %s", operation, session.user.id)
 
             # Get workspace permission context
             permission_context = await self.get_workspace_permission_context(session, workspace_id)
@@ -334,17 +538,12 @@ class WorkspaceAccessController:
                 )
 
             # Apply operation-specific access policy
-            if operation in self._access_policies:
-                policy_validator = self._access_policies[operation]
-                is_allowed = await policy_validator(
-                    permission_context, agent_access_context, additional_context
-                )
-            else:
-                logger.warning(f"Unknown operation: {operation}")
-                is_allowed = False
+            is_allowed = self._check_operation_access(
+                operation, permission_context, agent_access_context
+            )
 
             # Log access decision
-            await self._log_access_decision(
+            self._log_access_decision(
                 session.user.id, operation, workspace_id, agent_id, is_allowed
             )
 
@@ -372,53 +571,41 @@ class WorkspaceAccessController:
             # Get workspace permission context
             permission_context = await self.get_workspace_permission_context(session, workspace_id)
 
-            # Get all agents in workspace
-            async with get_async_session_context() as db_session:
-                from packages.db.parlant_schema import parlantAgent
-
-                agents_query = select(parlantAgent.id, parlantAgent.createdBy).where(
-                    and_(
-                        parlantAgent.workspaceId == workspace_id,
-                        parlantAgent.deletedAt.is_(None)
-                    )
+            # Resolve the operation to a row filter once in Python and let
+            # SQL do the filtering, instead of fetching every agent and
+            # re-running the access-level ladder per row
+            if (permission_context.is_owner
+                    or permission_context.has_minimum_permission(PermissionLevel.ADMIN)):
+                # Owners/admins hold MANAGE on every agent - no filter
+                creator_only = False
+            elif operation == 'agent_interaction':
+                # Workspace membership grants at least VIEW on every agent
+                creator_only = False
+            elif operation == 'agent_configuration':
+                # Non-admins can only configure agents they created
+                creator_only = True
+            else:
+                # Management/deletion (and unknown operations) require
+                # MANAGE, which non-admins never hold
+                logger.debug(
+                    f"User {session.user.id} has access to 0 agents "
+                    f"in workspace {workspace_id} for operation {operation}"
                 )
-                agents_result = await db_session.execute(agents_query)
-                agents = agents_result.all()
-
-                # Filter agents based on access level
-                accessible_agent_ids = []
-
-                for agent_id, created_by in agents:
-                    try:
-                        # Create mock agent context for access validation
-                        mock_agent_context = AgentAccessContext(
-                            agent_id=agent_id,
-                            workspace_id=workspace_id,
-                            created_by=created_by,
-                            access_level=AgentAccessLevel.NONE,  # Will be determined
-                            permission_context=permission_context
-                        )
-
-                        # Determine access level for this agent
-                        access_level = await self._determine_agent_access_level(
-                            permission_context, type('MockAgent', (), {
-                                'id': agent_id,
-                                'createdBy': created_by,
-                                'workspaceId': workspace_id
-                            })(), session.user.id
-                        )
+                return []
 
-                        mock_agent_context.access_level = access_level
+            async with get_async_session_context() as db_session:
+                parlantAgent = _get_schema_tables()[2]
 
-                        # Check if user has required access for operation
-                        if await self._has_required_access_for_operation(
-                            operation, mock_agent_context
-                        ):
-                            accessible_agent_ids.append(agent_id)
+                conditions = [
+                    parlantAgent.workspaceId == workspace_id,
+                    parlantAgent.deletedAt.is_(None)
+                ]
+                if creator_only:
+                    conditions.append(parlantAgent.createdBy == session.user.id)
 
-                    except Exception as e:
-                        logger.warning(f"Error checking access for agent {agent_id}: {e}")
-                        continue
+                agents_query = select(parlantAgent.id).where(and_(*conditions))
+                agents_result = await db_session.execute(agents_query)
+                accessible_agent_ids = [row[0] for row in agents_result.all()]
 
                 logger.debug(
                     f"User {session.user.id} has access to {len(accessible_agent_ids)} agents "
@@ -431,77 +618,38 @@ class WorkspaceAccessController:
             logger.error(f"Error getting accessible agents: {e}")
             return []
 
-    # Private access policy validators
-
-    async def _validate_agent_creation_access(
-        self,
-        permission_context: WorkspacePermissionContext,
-        agent_context: Optional[AgentAccessContext],
-        additional_context: Optional[Dict[str, Any]]
-    ) -> bool:
-        """Validate access to create agents in workspace."""
-        return permission_context.can_create_agents()
-
-    async def _validate_agent_interaction_access(
-        self,
-        permission_context: WorkspacePermissionContext,
-        agent_context: Optional[AgentAccessContext],
-        additional_context: Optional[Dict[str, Any]]
-    ) -> bool:
-        """Validate access to interact with specific agent."""
-        if not agent_context:
-            return False
-
-        # Users can interact with agents if they have at least VIEW access
-        return agent_context.access_level in [
-            AgentAccessLevel.VIEW,
-            AgentAccessLevel.INTERACT,
-            AgentAccessLevel.CONFIGURE,
-            AgentAccessLevel.MANAGE
-        ]
-
-    async def _validate_agent_configuration_access(
+    def _check_operation_access(
         self,
+        operation: str,
         permission_context: WorkspacePermissionContext,
-        agent_context: Optional[AgentAccessContext],
-        additional_context: Optional[Dict[str, Any]]
+        agent_context: Optional[AgentAccessContext]
     ) -> bool:
-        """Validate access to configure agent settings."""
-        if not agent_context:
-            return False
+        """Apply the access policy for a single operation.
 
-        return agent_context.access_level in [
-            AgentAccessLevel.CONFIGURE,
-            AgentAccessLevel.MANAGE
-        ]
+        Most operations reduce to a membership test against the
+        _OP_ALLOWED_LEVELS table; creation and deletion carry their own
+        rules (workspace-level creation rights, and admin-or-creator
+        for deletion).
+        """
+        if operation == 'agent_creation':
+            return permission_context.can_create_agents()
 
-    async def _validate_agent_management_access(
-        self,
-        permission_context: WorkspacePermissionContext,
-        agent_context: Optional[AgentAccessContext],
-        additional_context: Optional[Dict[str, Any]]
-    ) -> bool:
-        """Validate access to manage agent (full access)."""
-        if not agent_context:
+        if agent_context is None:
             return False
 
-        return agent_context.access_level == AgentAccessLevel.MANAGE
+        if operation == 'agent_deletion':
+            # Only workspace admins or agent creators can delete agents
+            return (permission_context.has_minimum_permission(PermissionLevel.ADMIN) or
+                    agent_context.created_by == permission_context.user_id)
 
-    async def _validate_agent_deletion_access(
-        self,
-        permission_context: WorkspacePermissionContext,
-        agent_context: Optional[AgentAccessContext],
-        additional_context: Optional[Dict[str, Any]]
-    ) -> bool:
-        """Validate access to delete agent."""
-        if not agent_context:
+        allowed_levels = _OP_ALLOWED_LEVELS.get(operation)
+        if allowed_levels is None:
+            logger.warning(f"Unknown operation: {operation}")
             return False
 
-        # Only workspace admins or agent creators can delete agents
-        return (permission_context.has_minimum_permission(PermissionLevel.ADMIN) or
-                agent_context.created_by == permission_context.user_id)
+        return agent_context.access_level in allowed_levels
 
-    async def _determine_agent_access_level(
+    def _determine_agent_access_level(
         self,
         permission_context: WorkspacePermissionContext,
         agent: Any,
@@ -527,7 +675,7 @@ class WorkspaceAccessController:
 
         return AgentAccessLevel.NONE
 
-    async def _get_agent_access_restrictions(
+    def _get_agent_access_restrictions(
         self,
         permission_context: WorkspacePermissionContext,
         agent: Any
@@ -546,52 +694,66 @@ class WorkspaceAccessController:
 
         return restrictions
 
-    async def _has_required_access_for_operation(
+    def _log_access_decision(
         self,
+        user_id: str,
         operation: str,
-        agent_context: AgentAccessContext
-    ) -> bool:
-        """Check if agent context has required access for operation."""
-        operation_requirements = {
-            'agent_interaction': [
-                AgentAccessLevel.VIEW,
-                AgentAccessLevel.INTERACT,
-                AgentAccessLevel.CONFIGURE,
-                AgentAccessLevel.MANAGE
-            ],
-            'agent_configuration': [
-                AgentAccessLevel.CONFIGURE,
-                AgentAccessLevel.MANAGE
-            ],
-            'agent_management': [AgentAccessLevel.MANAGE],
-            'agent_deletion': [AgentAccessLevel.MANAGE]
-        }
-
-        required_levels = operation_requirements.get(operation, [])
-        return agent_context.access_level in required_levels
-
-    async def _log_access_decision(
+        workspace_id: str,
+        agent_id: Optional[str],
+        is_allowed: bool
+    ):
+        """Log access control decisions for audit purposes."""
+        # Grants log at DEBUG and are usually filtered out in production,
+        # so gate on the level and let logging defer the formatting; the
+        # record's own timestamp replaces the hand-built isoformat field
+        level = logging.DEBUG if is_allowed else logging.WARNING
+        if not logger.isEnabledFor(level):
+            return
+
+        try:
+            if self._audit_queue is None:
+                asyncio.get_running_loop()
+                self._audit_queue = asyncio.Queue(maxsize=10000)
+            if self._audit_task is None or self._audit_task.done():
+                self._audit_task = asyncio.get_running_loop().create_task(
+                    self._drain_audit_queue()
+                )
+            self._audit_queue.put_nowait(
+                (level, user_id, operation, workspace_id, agent_id, is_allowed)
+            )
+            return
+        except (RuntimeError, asyncio.QueueFull):
+            # No running loop, or the queue is saturated - emit inline
+            # rather than dropping an audit record
+            pass
+
+        self._emit_access_log(
+            level, user_id, operation, workspace_id, agent_id, is_allowed
+        )
+
+    async def _drain_audit_queue(self):
+        """Emit queued access-decision records off the request path."""
+        queue = self._audit_queue
+        while True:
+            entry = await queue.get()
+            self._emit_access_log(*entry)
+            queue.task_done()
+
+    def _emit_access_log(
         self,
+        level: int,
         user_id: str,
         operation: str,
         workspace_id: str,
         agent_id: Optional[str],
         is_allowed: bool
     ):
-        """Log access control decisions for audit purposes."""
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'user_id': user_id,
-            'operation': operation,
-            'workspace_id': workspace_id,
-            'agent_id': agent_id,
-            'access_granted': is_allowed
-        }
-
-        if is_allowed:
-            logger.debug(f"ACCESS_GRANTED: {log_entry}")
-        else:
-            logger.warning(f"ACCESS_DENIED: {log_entry}")
+        logger.log(
+            level,
+            "%s: user=%s operation=%s workspace=%s agent=%s",
+            "ACCESS_GRANTED" if is_allowed else "ACCESS_DENIED",
+            user_id, operation, workspace_id, agent_id
+        )
 
 
 # Global instance
@@ -13,7 +13,7 @@ Features:
 """
 
 import logging
-from typing import Dict, Any, Optional, List, Set, AsyncContextManager
+from typing import Dict, Any, Optional, List, Set, Tuple, AsyncContextManager
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
@@ -32,6 +32,15 @@ from auth.permission_validator import PermissionValidator, PermissionResult
 logger = logging.getLogger(__name__)
 
 
+# Workspace filter fragments, memoized by (table_name, has_user_filter,
+# has_soft_delete). A constant SQL text per key lets Postgres reuse its
+# prepared-statement plan instead of re-parsing a unique string per call
+_FILTER_TEMPLATES: Dict[Tuple[str, bool, bool], str] = {}
+
+_USER_FILTERED_TABLES = frozenset({'parlant_agent', 'parlant_session'})
+_SOFT_DELETE_TABLES = frozenset({'parlant_agent', 'parlant_tool'})
+
+
 @dataclass
 class OperationContext:
     """Context for a specific operation within a workspace."""
@@ -44,6 +53,15 @@ class OperationContext:
     started_at: datetime = field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
     error: Optional[str] = None
+    # Lazily created on first access; most operations never lock
+    _lock: Optional[asyncio.Lock] = field(default=None, repr=False)
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        """Per-operation lock, created on first use."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
 
     @property
     def is_active(self) -> bool:
@@ -80,7 +98,6 @@ class WorkspaceContextManager:
 
         # Active operation contexts
         self._active_operations: Dict[str, OperationContext] = {}
-        self._context_locks: Dict[str, asyncio.Lock] = {}
 
         # Context caching
         self._context_cache: Dict[str, Dict[str, Any]] = {}
@@ -136,9 +153,6 @@ class WorkspaceContextManager:
         # Store active operation
         self._active_operations[operation_id] = op_context
 
-        # Create context lock for thread safety
-        self._context_locks[operation_id] = asyncio.Lock()
-
         logger.info(
             f"Created operation context {operation_id} for user {user_id} "
             f"in workspace {workspace_id} (type: {operation_type})"
@@ -192,14 +206,14 @@ class WorkspaceContextManager:
             # Cleanup operation context
             await self._cleanup_operation_context(op_context.operation_id)
 
-    async def get_workspace_data_filter(
+    def get_workspace_data_filter(
         self,
         workspace_id: str,
         table_name: str,
         user_id: Optional[str] = None
-    ) -> str:
+    ) -> Tuple[str, Dict[str, Any]]:
         """
-        Generate SQL filter to ensure data is scoped to workspace.
+        Generate a parameterized SQL filter scoping data to a workspace.
 
         Args:
             workspace_id: Workspace to scope data to
@@ -207,21 +221,36 @@ class WorkspaceContextManager:
             user_id: Optional user ID for additional filtering
 
         Returns:
-            SQL WHERE clause for workspace filtering
+            (fragment, params) where the fragment uses bind parameters
+            (:ws_id, :uid) and params carries their values, for use as
+            session.execute(text(sql), params)
         """
-        base_filter = f"{table_name}.workspace_id = '{workspace_id}'"
+        has_user_filter = bool(user_id) and table_name in _USER_FILTERED_TABLES
+        has_soft_delete = table_name in _SOFT_DELETE_TABLES
+        key = (table_name, has_user_filter, has_soft_delete)
+
+        template = _FILTER_TEMPLATES.get(key)
+        if template is None:
+            template = f"{table_name}.workspace_id = :ws_id"
+
+            if has_user_filter:
+                # Users can see their own resources plus public/shared ones
+                template += (
+                    f" AND ({table_name}.created_by = :uid"
+                    f" OR {table_name}.status = 'active')"
+                )
+
+            # Add soft delete filtering
+            if has_soft_delete:
+                template += f" AND ({table_name}.deleted_at IS NULL)"
 
-        # Add user-specific filtering for certain operations
-        if user_id and table_name in ['parlant_agent', 'parlant_session']:
-            # Users can see their own resources plus public/shared ones
-            user_filter = f" AND ({table_name}.created_by = '{user_id}' OR {table_name}.status = 'active')"
-            base_filter += user_filter
+            _FILTER_TEMPLATES[key] = template
 
-        # Add soft delete filtering
-        if table_name in ['parlant_agent', 'parlant_tool']:
-            base_filter += f" AND ({table_name}.deleted_at IS NULL)"
+        params: Dict[str, Any] = {'ws_id': workspace_id}
+        if has_user_filter:
+            params['uid'] = user_id
 
-        return base_filter
+        return template, params
 
     async def validate_resource_access(
         self,
@@ -374,52 +403,54 @@ class WorkspaceContextManager:
             Dictionary containing workspace statistics
         """
         try:
-            # Get active agents
-            agents_query = text("""
-                SELECT COUNT(*) as count
-                FROM parlant_agent
-                WHERE workspace_id = :workspace_id AND status = 'active' AND deleted_at IS NULL
-            """)
-            agents_result = self.db_session.execute(agents_query, {'workspace_id': workspace_id}).fetchone()
-
-            # Get active sessions
-            sessions_query = text("""
-                SELECT COUNT(*) as count
-                FROM parlant_session
-                WHERE workspace_id = :workspace_id AND status = 'active'
-            """)
-            sessions_result = self.db_session.execute(sessions_query, {'workspace_id': workspace_id}).fetchone()
-
-            # Get recent activity
-            activity_query = text("""
-                SELECT COUNT(*) as count
-                FROM parlant_event e
-                JOIN parlant_session s ON e.session_id = s.id
-                WHERE s.workspace_id = :workspace_id AND e.created_at > :since
+            # Fetch all three counts in one round-trip: scalar subqueries
+            # return a single row instead of three sequential queries
+            stats_query = text("""
+                SELECT
+                    (SELECT COUNT(*)
+                     FROM parlant_agent
+                     WHERE workspace_id = :workspace_id
+                       AND status = 'active' AND deleted_at IS NULL) AS agents,
+                    (SELECT COUNT(*)
+                     FROM parlant_session
+                     WHERE workspace_id = :workspace_id
+                       AND status = 'active') AS sessions,
+                    (SELECT COUNT(*)
+                     FROM parlant_event e
+                     JOIN parlant_session s ON e.session_id = s.id
+                     WHERE s.workspace_id = :workspace_id
+                       AND e.created_at > :since) AS events
             """)
             since_time = datetime.now() - timedelta(hours=24)
-            activity_result = self.db_session.execute(activity_query, {
+            stats_result = self.db_session.execute(stats_query, {
                 'workspace_id': workspace_id,
                 'since': since_time
             }).fetchone()
 
-            # Get operation metrics for this workspace
-            workspace_operations = [
-                op for op in self._active_operations.values()
-                if op.workspace_id == workspace_id
-            ]
+            # Tally operation metrics for this workspace in one pass
+            # instead of building a list and filtering it three times
+            active_ops = completed_ops = failed_ops = 0
+            for op in self._active_operations.values():
+                if op.workspace_id != workspace_id:
+                    continue
+                if op.error:
+                    failed_ops += 1
+                elif op.is_active:
+                    active_ops += 1
+                else:
+                    completed_ops += 1
 
             operation_stats = {
-                'active_operations': len([op for op in workspace_operations if op.is_active]),
-                'completed_operations': len([op for op in workspace_operations if not op.is_active and not op.error]),
-                'failed_operations': len([op for op in workspace_operations if op.error])
+                'active_operations': active_ops,
+                'completed_operations': completed_ops,
+                'failed_operations': failed_ops
             }
 
             return {
                 'workspace_id': workspace_id,
-                'active_agents': agents_result.count if agents_result else 0,
-                'active_sessions': sessions_result.count if sessions_result else 0,
-                'recent_events': activity_result.count if activity_result else 0,
+                'active_agents': stats_result.agents if stats_result else 0,
+                'active_sessions': stats_result.sessions if stats_result else 0,
+                'recent_events': stats_result.events if stats_result else 0,
                 'operations': operation_stats,
                 'generated_at': datetime.now().isoformat()
             }
@@ -467,9 +498,6 @@ class WorkspaceContextManager:
         if operation_id in self._active_operations:
             del self._active_operations[operation_id]
 
-        if operation_id in self._context_locks:
-            del self._context_locks[operation_id]
-
     async def _record_operation_metrics(self, operation_context: OperationContext):
         """Record performance metrics for an operation."""
         if operation_context.operation_type not in self._operation_metrics:
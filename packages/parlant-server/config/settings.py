@@ -42,6 +42,10 @@ class Settings(BaseSettings):
     jwt_secret_key: str = Field(default="dev-secret-key-123", env="BETTER_AUTH_SECRET")  # Reuse Better Auth secret
     jwt_algorithm: str = Field(default="HS256", env="JWT_ALGORITHM")
     jwt_expire_hours: int = Field(default=24, env="JWT_EXPIRE_HOURS")
+    auth_cache_size: int = Field(default=10000, env="AUTH_CACHE_SIZE")
+    auth_max_concurrent: int = Field(default=50, env="AUTH_MAX_CONCURRENT")
+    mapping_cache_size: int = Field(default=5000, env="MAPPING_CACHE_SIZE")
+    permission_cache_size: int = Field(default=4096, env="PERMISSION_CACHE_SIZE")
 
     # Webhook configuration for Sim integration
     sim_webhook_secret: Optional[str] = Field(default=None, env="SIM_WEBHOOK_SECRET")
@@ -469,8 +469,8 @@ class WorkspaceLifecycleHandler:
 
         logger.info(f"Adding member {user_id} to workspace {workspace_id} with {permission_level} permissions")
 
-        # Clear relevant caches
-        cache_key = f"{user_id}:{workspace_id}"
+        # Clear relevant caches (keys are (user_id, workspace_id) tuples)
+        cache_key = (user_id, workspace_id)
         if cache_key in workspace_access_controller._permission_cache:
             del workspace_access_controller._permission_cache[cache_key]
 
@@ -492,21 +492,22 @@ class WorkspaceLifecycleHandler:
 
         logger.info(f"Removing member {user_id} from workspace {workspace_id}")
 
-        # Clear all caches for this user/workspace combination
-        cache_keys_to_remove = []
-        for cache_key in workspace_access_controller._permission_cache.keys():
-            if cache_key.startswith(f"{user_id}:"):
-                cache_keys_to_remove.append(cache_key)
-
+        # Clear all caches for this user (cache keys are tuples whose
+        # first component is the user id)
+        cache_keys_to_remove = [
+            cache_key
+            for cache_key in workspace_access_controller._permission_cache.keys()
+            if cache_key[0] == user_id
+        ]
         for cache_key in cache_keys_to_remove:
             del workspace_access_controller._permission_cache[cache_key]
 
         # Clear agent access cache entries
-        agent_cache_keys_to_remove = []
-        for cache_key in workspace_access_controller._agent_access_cache.keys():
-            if cache_key.startswith(f"{user_id}:"):
-                agent_cache_keys_to_remove.append(cache_key)
-
+        agent_cache_keys_to_remove = [
+            cache_key
+            for cache_key in workspace_access_controller._agent_access_cache.keys()
+            if cache_key[0] == user_id
+        ]
         for cache_key in agent_cache_keys_to_remove:
             del workspace_access_controller._agent_access_cache[cache_key]
 
@@ -528,12 +529,13 @@ class WorkspaceLifecycleHandler:
 
         logger.info(f"Transferring ownership of workspace {workspace_id} from {old_owner_id} to {new_owner_id}")
 
-        # Clear all permission caches for this workspace
-        cache_keys_to_remove = []
-        for cache_key in workspace_access_controller._permission_cache.keys():
-            if cache_key.endswith(f":{workspace_id}"):
-                cache_keys_to_remove.append(cache_key)
-
+        # Clear all permission caches for this workspace (cache keys are
+        # tuples whose last component is the workspace id)
+        cache_keys_to_remove = [
+            cache_key
+            for cache_key in workspace_access_controller._permission_cache.keys()
+            if cache_key[-1] == workspace_id
+        ]
         for cache_key in cache_keys_to_remove:
             del workspace_access_controller._permission_cache[cache_key]
 
@@ -26,6 +26,7 @@ class MockSettings:
     def __init__(self):
         self.jwt_secret_key = "test_secret_key_at_least_32_chars_long_for_security"
         self.jwt_algorithm = "HS256"
+        self.auth_cache_size = 1000
         self.sim_base_url = "http://localhost:3000"
         self.audit_log_dir = "/tmp/test_audit"
         self.audit_console_output = False
@@ -480,9 +481,7 @@ class TestIntegrationScenarios:
             mock_client.return_value = mock_instance
 
             # Mock session validation response
-            mock_session_response = Mock()
-            mock_session_response.status_code = 200
-            mock_session_response.json.return_value = {
+            session_payload = {
                 "user": {
                     "id": "user123",
                     "name": "Test User",
@@ -500,11 +499,13 @@ class TestIntegrationScenarios:
                     "activeOrganizationId": "org123"
                 }
             }
+            mock_session_response = Mock()
+            mock_session_response.status_code = 200
+            mock_session_response.json.return_value = session_payload
+            mock_session_response.content = json.dumps(session_payload).encode()
 
             # Mock workspaces response
-            mock_workspaces_response = Mock()
-            mock_workspaces_response.status_code = 200
-            mock_workspaces_response.json.return_value = {
+            workspaces_payload = {
                 "workspaces": [
                     {
                         "id": "workspace123",
@@ -516,6 +517,18 @@ class TestIntegrationScenarios:
                     }
                 ]
             }
+            mock_workspaces_response = Mock()
+            mock_workspaces_response.status_code = 200
+            mock_workspaces_response.json.return_value = workspaces_payload
+            mock_workspaces_response.headers = {}
+            mock_workspaces_response.aread = AsyncMock(
+                return_value=json.dumps(workspaces_payload).encode()
+            )
+
+            # Workspaces are fetched via a streaming request
+            mock_stream_cm = AsyncMock()
+            mock_stream_cm.__aenter__.return_value = mock_workspaces_response
+            mock_instance.stream = Mock(return_value=mock_stream_cm)
 
             # Health check response
             mock_health_response = Mock()
@@ -523,8 +536,7 @@ class TestIntegrationScenarios:
 
             mock_instance.get.side_effect = [
                 mock_health_response,  # Health check
-                mock_session_response,  # Session validation
-                mock_workspaces_response  # Workspaces
+                mock_session_response  # Session validation
             ]
 
             # Initialize authentication system
@@ -537,13 +549,13 @@ class TestIntegrationScenarios:
             session = await auth_system.auth_bridge.validate_session_token("test_token")
             assert session is not None
             assert session.user.id == "user123"
-            assert len(session.user.workspaces) == 1
 
-            # Test workspace access
+            # Test workspace access (triggers the lazy workspace load)
             has_access = await auth_system.auth_bridge.validate_workspace_access(
                 session, "workspace123"
             )
             assert has_access is True
+            assert len(session.user.workspaces) == 1
 
             # Test rate limiting
             allowed, _ = await auth_system.rate_limiter.check_rate_limit(
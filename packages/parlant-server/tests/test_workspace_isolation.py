@@ -514,12 +514,15 @@ class TestSessionIsolation:
             return_value="e.session_id = 'session123' AND s.workspace_id = 'workspace1'"
         )
 
-        # Mock database query
+        # Mock database query (rows expose ._mapping like SQLAlchemy Row)
         event_rows = [
             Mock(
-                id="event1", event_type="customer_message", content={"text": "Hello"},
-                metadata={}, created_at=datetime.now(), tool_call_id=None,
-                journey_id=None, state_id=None
+                _mapping={
+                    "id": "event1", "event_type": "customer_message",
+                    "content": {"text": "Hello"}, "metadata": {},
+                    "created_at": datetime.now(), "tool_call_id": None,
+                    "journey_id": None, "state_id": None
+                }
             )
         ]
         session_manager.db_session.execute.return_value.fetchall.return_value = event_rows
@@ -478,8 +478,9 @@ class WorkspaceIsolationManager:
             if datetime.now() - cached_context.created_at < self._cache_ttl:
                 return cached_context
 
-        # Validate workspace access using Sim's permission system
-        user_workspaces = session.user.workspaces or []
+        # Validate workspace access using Sim's permission system;
+        # workspaces load lazily, so resolve them before scanning
+        user_workspaces = await session.ensure_workspaces()
         workspace_found = None
 
         for workspace in user_workspaces: